@@ -5,16 +5,20 @@ Real-time visualization with improved UI and informative displays
 
 import streamlit as st
 import time
-import pandas as pd
 from traffic_controller import (
-    TrafficController, SignalState, Intersection
+    TrafficController, SignalState, Intersection, STATE_CODES
 )
 import plotly.graph_objects as go
-import plotly.express as px
+from plotly.subplots import make_subplots
+import numpy as np
+from collections import deque
 from datetime import datetime
-import random
+import csv
 import io
-from typing import List
+import re
+import string
+from itertools import islice
+from typing import Hashable, List
 
 # Page configuration
 st.set_page_config(
@@ -25,7 +29,7 @@ st.set_page_config(
 )
 
 # Enhanced Custom CSS with modern design
-st.markdown("""
+_STATIC_CSS = """
     <style>
     /* Import Google Fonts */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
@@ -98,36 +102,18 @@ st.markdown("""
         background: linear-gradient(135deg, #fff9c4 0%, #fff59d 100%);
         border: 3px solid #ffeb3b;
         box-shadow: 0 0 20px rgba(255, 235, 59, 0.3);
-        animation: pulse-yellow 2s infinite;
     }
     
     .green-signal {
         background: linear-gradient(135deg, #e8f5e9 0%, #c8e6c9 100%);
         border: 3px solid #4caf50;
         box-shadow: 0 0 20px rgba(76, 175, 80, 0.3);
-        animation: pulse-green 1.5s infinite;
     }
     
     .emergency-signal {
         background: linear-gradient(135deg, #fce4ec 0%, #f8bbd0 100%);
         border: 3px solid #e91e63;
         box-shadow: 0 0 30px rgba(233, 30, 99, 0.5);
-        animation: blink 0.8s infinite;
-    }
-    
-    @keyframes blink {
-        0%, 50%, 100% { opacity: 1; transform: scale(1); }
-        25%, 75% { opacity: 0.7; transform: scale(0.98); }
-    }
-    
-    @keyframes pulse-green {
-        0%, 100% { box-shadow: 0 0 20px rgba(76, 175, 80, 0.3); }
-        50% { box-shadow: 0 0 30px rgba(76, 175, 80, 0.6); }
-    }
-    
-    @keyframes pulse-yellow {
-        0%, 100% { box-shadow: 0 0 20px rgba(255, 235, 59, 0.3); }
-        50% { box-shadow: 0 0 30px rgba(255, 235, 59, 0.6); }
     }
     
     /* Metric Cards - Enhanced */
@@ -146,6 +132,56 @@ st.markdown("""
         box-shadow: 0 6px 20px rgba(0,0,0,0.15);
     }
     
+    /* Top metrics row and insight cards, each rendered as one HTML grid */
+    .metrics-grid {
+        display: grid;
+        grid-template-columns: repeat(6, 1fr);
+        gap: 1rem;
+    }
+    
+    .insights-grid {
+        display: grid;
+        grid-template-columns: repeat(3, 1fr);
+        gap: 1rem;
+    }
+    
+    .feature-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 1rem;
+    }
+    
+    .guide-grid {
+        display: grid;
+        grid-template-columns: repeat(2, 1fr);
+        gap: 1rem;
+    }
+    
+    .metric-cell-label {
+        font-size: 0.875rem;
+        color: #555;
+    }
+    
+    .metric-cell-value {
+        font-size: 2rem;
+        font-weight: 600;
+        color: #333;
+        line-height: 1.4;
+    }
+    
+    .metric-cell-delta {
+        display: inline-block;
+        font-size: 0.8rem;
+        color: #09ab3b;
+        background: rgba(9, 171, 59, 0.1);
+        padding: 0.1rem 0.5rem;
+        border-radius: 1rem;
+    }
+    
+    .metric-cell-delta::before {
+        content: "↑ ";
+    }
+    
     /* Status Indicator */
     .status-indicator {
         display: inline-block;
@@ -290,18 +326,156 @@ st.markdown("""
         .main-header h1 {
             font-size: 1.8rem;
         }
+        
+        .metrics-grid {
+            grid-template-columns: repeat(2, 1fr);
+        }
+        
+        .insights-grid, .guide-grid {
+            grid-template-columns: 1fr;
+        }
+        
+        .feature-grid {
+            grid-template-columns: repeat(2, 1fr);
+        }
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+# Upper bound on events retained in the session (ring buffer)
+_EVENT_HISTORY_LEN = 5000
+
+# Opt-in on-disk log for users who need the full, unbounded history
+_EVENT_LOG_FILE = "traffic_signal_events.log"
+
+# Shared by every figure: the fragments redraw often, so skip Plotly's
+# transition tween, keep UI state across redraws and disable drag interactions
+_LIVE_FIGURE_LAYOUT = dict(
+    transition=dict(duration=0),
+    uirevision='static',
+    dragmode=False
+)
+
+# Figures have fixed sizes, so Plotly's resize observer is switched off too
+_CHART_CONFIG = {'responsive': False}
+
+# Per-state presentation lookups for the signal status cards and the diagram
+_STATE_META = {
+    SignalState.RED: ("red-signal", "🔴"),
+    SignalState.YELLOW: ("yellow-signal", "🟡"),
+    SignalState.GREEN: ("green-signal", "🟢"),
+    SignalState.EMERGENCY: ("emergency-signal", "🚨"),
+}
+
+# (color, glow, size, border) for each signal light in the intersection diagram
+_SIGNAL_STYLE = {
+    SignalState.GREEN: ("#00C853", "rgba(0, 200, 83, 0.4)", 60, "#1B5E20"),
+    SignalState.YELLOW: ("#FFD600", "rgba(255, 214, 0, 0.4)", 60, "#F57F17"),
+    SignalState.EMERGENCY: ("#FF1744", "rgba(255, 23, 68, 0.6)", 70, "#B71C1C"),
+    SignalState.RED: ("#D32F2F", "rgba(211, 47, 47, 0.3)", 60, "#B71C1C"),
+}
+
+
+@st.cache_resource
+def _inject_css():
+    """Inject the global stylesheet (cached, replayed on every rerun)"""
+    st.markdown(_STATIC_CSS, unsafe_allow_html=True)
 
 
 def initialize_session_state():
     """Initialize Streamlit session state"""
+    _inject_css()
+    
     if 'controller' not in st.session_state:
         st.session_state.controller = None
         st.session_state.running = False
         st.session_state.start_time = None
-        st.session_state.event_history = []
+        st.session_state.event_history = deque(maxlen=_EVENT_HISTORY_LEN)
+        st.session_state.events_seen = 0
+
+
+def append_events_to_file(events: List[str], path: str = _EVENT_LOG_FILE):
+    """
+    Append events to the on-disk log instead of retaining them in memory
+    
+    Args:
+        events: New event log strings
+        path: Log file path
+    """
+    if not events:
+        return
+    
+    with open(path, 'a', encoding='utf-8') as log_file:
+        log_file.write("\n".join(events) + "\n")
+
+
+# Event log parsing: "[HH:MM:SS.mmm] Message"
+_LOG_RE = re.compile(r'^\[(?P<ts>[^\]]*)\]\s*(?P<msg>.*)$')
+_DIR_RE = re.compile(r'\b(NORTH|SOUTH|EAST|WEST)\b')
+
+# Ordered (state keyword, message marker, action) rules; first match wins.
+# Precedence matters ("✓ NORTH is now EMERGENCY" is an ENTER), which a single
+# leftmost-match regex cannot express, so this stays a short ordered table.
+_ACTION_TABLE = (
+    ("GREEN", "✓", "ENTER"),
+    ("RED", "✗", "EXIT"),
+    ("YELLOW", "⚠", "WARN"),
+    ("EMERGENCY", "🚨", "EMERGENCY"),
+)
+
+_CSV_COLUMNS = ['Timestamp', 'Direction', 'State', 'Action', 'Full_Message']
+
+
+def _find_direction(text: str) -> str:
+    """Return the first compass direction in text, or an empty string"""
+    match = _DIR_RE.search(text)
+    return match.group(1) if match else ""
+
+
+def _parse_event(event: str) -> tuple:
+    """
+    Split one event log line into its CSV columns
+    
+    Args:
+        event: Event log string
+        
+    Returns:
+        Tuple of (timestamp, direction, state, action, message)
+    """
+    match = _LOG_RE.match(event)
+    if match:
+        timestamp, message = match.group('ts'), match.group('msg').strip()
+    else:
+        timestamp, message = "N/A", event
+    
+    direction = ""
+    state = ""
+    action = ""
+    
+    if "is now" in message:
+        direction_part, _, state = message.partition("is now")
+        state = state.strip()
+        direction = _find_direction(direction_part)
+        
+        for keyword, marker, rule_action in _ACTION_TABLE:
+            if keyword in state or marker in message:
+                action = rule_action
+                break
+    
+    elif "EMERGENCY" in message or "🚨" in message:
+        action = "EMERGENCY"
+        direction = _find_direction(message)
+        state = "EMERGENCY"
+    
+    elif "STARTED" in message:
+        action = "SYSTEM_START"
+        state = "ACTIVE"
+    
+    elif "STOPPING" in message:
+        action = "SYSTEM_STOP"
+        state = "INACTIVE"
+    
+    return timestamp, direction, state, action, message
 
 
 def export_logs_to_csv(events: List[str]) -> bytes:
@@ -317,90 +491,40 @@ def export_logs_to_csv(events: List[str]) -> bytes:
     if not events:
         return b""
     
-    # Parse events into structured data
-    log_data = []
-    for event in events:
-        # Extract timestamp and message
-        # Format: [HH:MM:SS.mmm] Message
-        if '[' in event and ']' in event:
-            timestamp = event[event.find('[')+1:event.find(']')]
-            message = event[event.find(']')+2:].strip()
-        else:
-            timestamp = "N/A"
-            message = event
-        
-        # Parse message components
-        direction = ""
-        state = ""
-        action = ""
-        
-        if "is now" in message:
-            parts = message.split("is now")
-            direction_part = parts[0].strip()
-            state = parts[1].strip() if len(parts) > 1 else ""
-            
-            # Extract direction
-            for dir_name in ["NORTH", "SOUTH", "EAST", "WEST"]:
-                if dir_name in direction_part:
-                    direction = dir_name
-                    break
-            
-            # Determine action
-            if "GREEN" in state or "✓" in message:
-                action = "ENTER"
-            elif "RED" in state or "✗" in message:
-                action = "EXIT"
-            elif "YELLOW" in state or "⚠" in message:
-                action = "WARN"
-            elif "EMERGENCY" in state or "🚨" in message:
-                action = "EMERGENCY"
-        
-        elif "EMERGENCY" in message or "🚨" in message:
-            action = "EMERGENCY"
-            for dir_name in ["NORTH", "SOUTH", "EAST", "WEST"]:
-                if dir_name in message:
-                    direction = dir_name
-                    break
-            state = "EMERGENCY"
-        
-        elif "STARTED" in message:
-            action = "SYSTEM_START"
-            state = "ACTIVE"
-        
-        elif "STOPPING" in message:
-            action = "SYSTEM_STOP"
-            state = "INACTIVE"
-        
-        log_data.append({
-            'Timestamp': timestamp,
-            'Direction': direction,
-            'State': state,
-            'Action': action,
-            'Full_Message': message
-        })
-    
-    # Create DataFrame
-    df = pd.DataFrame(log_data)
-    
-    # Convert to CSV
+    # Stream parsed rows straight into the CSV buffer
     csv_buffer = io.StringIO()
-    df.to_csv(csv_buffer, index=False)
+    writer = csv.writer(csv_buffer, lineterminator='\n')
+    writer.writerow(_CSV_COLUMNS)
+    for event in events:
+        writer.writerow(_parse_event(event))
     
     return csv_buffer.getvalue().encode('utf-8')
 
 
-def create_download_button_for_logs(events: List[str]):
+@st.cache_data(show_spinner=False, max_entries=8)
+def _export_logs_cached(log_key: Hashable, _events) -> bytes:
+    """
+    Cached CSV export keyed by log_key alone
+    
+    The leading underscore keeps Streamlit from hashing the (possibly
+    thousands of) events on every call; log_key must change whenever they do.
+    """
+    return export_logs_to_csv(_events)
+
+
+def create_download_button_for_logs(events, log_key: Hashable):
     """
     Create a download button for event logs as CSV
     
     Args:
-        events: List of event log strings
+        events: Sequence of event log strings
+        log_key: Cheap key identifying this exact set of events
     """
     if not events:
         st.info("📭 No events to export yet")
         return
     
-    csv_data = export_logs_to_csv(events)
+    csv_data = _export_logs_cached(log_key, events)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"traffic_signal_logs_{timestamp}.csv"
     
@@ -414,179 +538,242 @@ def create_download_button_for_logs(events: List[str]):
     )
 
 
-def create_intersection_diagram(intersection: Intersection, signals: list):
-    """Create a clean, professional intersection visualization"""
+# Signal light hover, filled in by Plotly from text=direction and
+# customdata=[cycles, seconds in state, state label]
+_SIGNAL_HOVER = (
+    "<b style='font-size:14px'>🚦 %{text}</b><br>"
+    "<b>State:</b> <span style='font-size:13px'>%{customdata[2]}</span><br>"
+    "<b>Cycles:</b> %{customdata[0]}<br>"
+    "<b>Time:</b> %{customdata[1]:.1f}s<br>"
+    "<extra></extra>"
+)
+
+# Signal light positions and the arrow drawn on each housing
+_SIGNAL_CONFIG = {
+    "NORTH": {"pos": (0.35, 1.5), "arrow": "▼", "offset": (0.25, 0)},
+    "SOUTH": {"pos": (-0.35, -1.5), "arrow": "▲", "offset": (-0.25, 0)},
+    "EAST": {"pos": (1.5, -0.35), "arrow": "◀", "offset": (0, -0.25)},
+    "WEST": {"pos": (-1.5, 0.35), "arrow": "▶", "offset": (0, 0.25)}
+}
+
+
+def _make_static_shapes() -> tuple:
+    """Precompute every static diagram shape (roads, markings, housings) as layout dicts"""
+    no_line = dict(width=0)
+    
+    # Main intersection area (light gray), vertical and horizontal roads
+    roads = (
+        dict(type="rect", x0=-0.7, y0=-0.7, x1=0.7, y1=0.7,
+             fillcolor="#e0e0e0", line=no_line, layer='below'),
+        dict(type="rect", x0=-0.5, y0=-2.8, x1=0.5, y1=2.8,
+             fillcolor="#4a4a4a", line=no_line, layer='below'),
+        dict(type="rect", x0=-2.8, y0=-0.5, x1=2.8, y1=0.5,
+             fillcolor="#4a4a4a", line=no_line, layer='below'),
+    )
     
-    # Get signal states
-    signal_dict = {s.direction: s for s in signals}
+    # Lane dividers - dashed center lines in both axes
+    dash_start = (np.arange(-28, 29, 4) / 10).tolist()
+    dash_end = ((np.arange(-28, 29, 4) + 2) / 10).tolist()
+    dash_line = dict(color="white", width=3)
+    dashes = tuple(
+        dict(type="line", x0=0, y0=a, x1=0, y1=b, line=dash_line, layer='below')
+        for a, b in zip(dash_start, dash_end)
+    ) + tuple(
+        dict(type="line", x0=a, y0=0, x1=b, y1=0, line=dash_line, layer='below')
+        for a, b in zip(dash_start, dash_end)
+    )
+    
+    # Crosswalk stripes - six per approach, rows of (x0, y0, x1, y1)
+    lo = -0.4 + np.arange(6) * 0.15
+    hi = lo + 0.1
+    ones = np.ones_like(lo)
+    stripes = np.concatenate([
+        np.stack([lo, 0.75 * ones, hi, 0.95 * ones], axis=1),     # North
+        np.stack([lo, -0.95 * ones, hi, -0.75 * ones], axis=1),   # South
+        np.stack([0.75 * ones, lo, 0.95 * ones, hi], axis=1),     # East
+        np.stack([-0.95 * ones, lo, -0.75 * ones, hi], axis=1),   # West
+    ])
+    crosswalks = tuple(
+        dict(type="rect", x0=x0, y0=y0, x1=x1, y1=y1,
+             fillcolor="white", line=no_line, layer='below', opacity=0.9)
+        for x0, y0, x1, y1 in stripes.tolist()
+    )
+    
+    # Signal housings (black boxes)
+    housings = tuple(
+        dict(type="rect", x0=x-0.18, y0=y-0.25, x1=x+0.18, y1=y+0.25,
+             fillcolor="#1a1a1a", line=dict(color="#000000", width=2), layer='below')
+        for x, y in (config["pos"] for config in _SIGNAL_CONFIG.values())
+    )
+    
+    return roads + dashes + crosswalks + housings
+
+
+_STATIC_SHAPES = _make_static_shapes()
+
+
+@st.cache_resource
+def _build_static_background() -> go.Figure:
+    """
+    Build the never-changing part of the intersection diagram once
     
-    # Create figure with clean background
+    Roads, lane dashes, crosswalks, signal housings/poles and the layout are identical
+    on every frame; callers copy this figure and only add the dynamic traces.
+    Treat the returned figure as read-only since it is shared between reruns.
+    """
     fig = go.Figure()
     
-    # ========== CLEAN ROAD DESIGN ==========
-    
-    # Main intersection area (light gray)
-    fig.add_shape(type="rect", x0=-0.7, y0=-0.7, x1=0.7, y1=0.7,
-                  fillcolor="#e0e0e0", line=dict(width=0), layer='below')
-    
-    # Vertical road (North-South)
-    fig.add_shape(type="rect", x0=-0.5, y0=-2.8, x1=0.5, y1=2.8,
-                  fillcolor="#4a4a4a", line=dict(width=0), layer='below')
-    
-    # Horizontal road (East-West)
-    fig.add_shape(type="rect", x0=-2.8, y0=-0.5, x1=2.8, y1=0.5,
-                  fillcolor="#4a4a4a", line=dict(width=0), layer='below')
-    
-    # Lane dividers - Clean dashed lines
-    # Vertical center line
-    dash_y_positions = list(range(-28, 29, 4))
-    for y in dash_y_positions:
-        fig.add_shape(type="line", x0=0, y0=y/10, x1=0, y1=(y+2)/10,
-                      line=dict(color="white", width=3), layer='below')
-    
-    # Horizontal center line
-    dash_x_positions = list(range(-28, 29, 4))
-    for x in dash_x_positions:
-        fig.add_shape(type="line", x0=x/10, y0=0, x1=(x+2)/10, y1=0,
-                      line=dict(color="white", width=3), layer='below')
-    
-    # Crosswalk stripes - Clean white rectangles
-    crosswalk_positions = [
-        # North
-        [(-0.4+i*0.15, 0.75), (-0.3+i*0.15, 0.95)] for i in range(6)
-    ] + [
-        # South
-        [(-0.4+i*0.15, -0.95), (-0.3+i*0.15, -0.75)] for i in range(6)
-    ] + [
-        # East
-        [(0.75, -0.4+i*0.15), (0.95, -0.3+i*0.15)] for i in range(6)
-    ] + [
-        # West
-        [(-0.95, -0.4+i*0.15), (-0.75, -0.3+i*0.15)] for i in range(6)
-    ]
-    
-    for (x0, y0), (x1, y1) in crosswalk_positions:
-        fig.add_shape(type="rect", x0=x0, y0=y0, x1=x1, y1=y1,
-                      fillcolor="white", line=dict(width=0), layer='below', opacity=0.9)
+    # ========== SIGNAL POLES & ARROWS ==========
+    
+    pole_x, pole_y = [], []
+    arrows = []
+    
+    for direction, config in _SIGNAL_CONFIG.items():
+        x, y = config["pos"]
+        
+        # Signal pole (gray), segments separated by None
+        pole_start_y = y - 0.45 if direction in ["NORTH", "SOUTH"] else y
+        pole_end_y = y - 0.25 if direction in ["NORTH", "SOUTH"] else y
+        pole_start_x = x if direction in ["NORTH", "SOUTH"] else x - 0.45 if direction == "EAST" else x + 0.45
+        pole_end_x = x if direction in ["NORTH", "SOUTH"] else x - 0.25 if direction == "EAST" else x + 0.25
+        
+        pole_x += [pole_start_x, pole_end_x, None]
+        pole_y += [pole_start_y, pole_end_y, None]
+        
+        # Direction arrow on signal
+        arrows.append(dict(
+            x=x, y=y,
+            text=f"<b style='font-size:18px'>{config['arrow']}</b>",
+            showarrow=False,
+            font=dict(color="white", size=18, family="Arial Black"),
+            bgcolor="rgba(0,0,0,0)"
+        ))
+    
+    fig.add_trace(go.Scatter(
+        x=pole_x, y=pole_y,
+        mode='lines',
+        line=dict(color='#505050', width=6),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    
+    # ========== LAYOUT ==========
+    
+    # Shapes and annotations go in with the layout as one batch instead of
+    # ~70 individually validated add_shape/add_annotation calls
+    fig.update_layout(
+        **_LIVE_FIGURE_LAYOUT,
+        shapes=_STATIC_SHAPES,
+        annotations=arrows,
+        title={
+            'text': "<b>🚦 Live Intersection Monitor</b>",
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 22, 'color': '#1a1a1a', 'family': 'Inter'}
+        },
+        xaxis=dict(
+            range=[-3.2, 3.2],
+            showgrid=False,
+            zeroline=False,
+            showticklabels=False,
+            scaleanchor="y",
+            scaleratio=1,
+            fixedrange=True
+        ),
+        yaxis=dict(
+            range=[-3.2, 3.2],
+            showgrid=False,
+            zeroline=False,
+            showticklabels=False,
+            fixedrange=True
+        ),
+        width=600,
+        height=540,
+        autosize=False,
+        showlegend=False,
+        plot_bgcolor='#b3d9ff',  # Light blue sky
+        paper_bgcolor='white',
+        margin=dict(l=20, r=20, t=70, b=20),
+        # Hover is only wanted on the signal lights; every other trace skips it
+        hovermode='closest',
+        spikedistance=0
+    )
+    
+    return fig
+
+
+# Queued vehicle slots per approach, nearest the stop line last
+_VEHICLE_CONFIG = {
+    "NORTH": [(0.2, 2.2), (0.2, 1.9), (0.2, 1.6)],
+    "SOUTH": [(-0.2, -2.2), (-0.2, -1.9), (-0.2, -1.6)],
+    "EAST": [(2.2, -0.2), (1.9, -0.2), (1.6, -0.2)],
+    "WEST": [(-2.2, 0.2), (-1.9, 0.2), (-1.6, 0.2)]
+}
+
+# Flow arrow shown in the box while a direction is green
+_FLOW_ARROWS = {
+    "NORTH": (0.25, 1.0, "▼"),
+    "SOUTH": (-0.25, -1.0, "▲"),
+    "EAST": (1.0, -0.25, "◀"),
+    "WEST": (-1.0, 0.25, "▶")
+}
+
+# Dynamic trace/annotation slots, appended after the static background's
+# pole trace and signal arrow annotations so they can be patched by index
+_GLOW_TRACE, _LIGHT_TRACE, _VEHICLE_TRACE, _FLOW_TRACE = 1, 2, 3, 4
+_FLOW_ANNOTATION = len(_SIGNAL_CONFIG)
+_STATUS_ANNOTATION = _FLOW_ANNOTATION + len(_FLOW_ARROWS)
+
+
+def _diagram_series(intersection: Intersection, signals: list) -> dict:
+    """Collect the per-point data of the diagram's dynamic traces"""
+    
+    # Get signal states
+    signal_dict = {s.direction: s for s in signals}
     
     # ========== TRAFFIC SIGNALS - Clean & Modern ==========
     
-    signal_config = {
-        "NORTH": {"pos": (0.35, 1.5), "arrow": "▼", "offset": (0.25, 0)},
-        "SOUTH": {"pos": (-0.35, -1.5), "arrow": "▲", "offset": (-0.25, 0)},
-        "EAST": {"pos": (1.5, -0.35), "arrow": "◀", "offset": (0, -0.25)},
-        "WEST": {"pos": (-1.5, 0.35), "arrow": "▶", "offset": (0, 0.25)}
-    }
+    # Per-point arrays so every layer is a single batched trace
+    glow_x, glow_y, glow_sizes, glow_colors = [], [], [], []
+    light_x, light_y, light_sizes, light_colors, light_borders = [], [], [], [], []
+    light_names, light_data = [], []
     
-    for direction, config in signal_config.items():
+    for direction, config in _SIGNAL_CONFIG.items():
         signal = signal_dict.get(direction)
         if not signal:
             continue
         
         x, y = config["pos"]
-        arrow = config["arrow"]
         
         # Determine signal appearance
-        if signal.state == SignalState.GREEN:
-            color = "#00C853"  # Bright green
-            glow = "rgba(0, 200, 83, 0.4)"
-            size = 60
-            border = "#1B5E20"
-        elif signal.state == SignalState.YELLOW:
-            color = "#FFD600"  # Bright yellow
-            glow = "rgba(255, 214, 0, 0.4)"
-            size = 60
-            border = "#F57F17"
-        elif signal.state == SignalState.EMERGENCY:
-            color = "#FF1744"  # Bright red
-            glow = "rgba(255, 23, 68, 0.6)"
-            size = 70
-            border = "#B71C1C"
-        else:  # RED
-            color = "#D32F2F"  # Red
-            glow = "rgba(211, 47, 47, 0.3)"
-            size = 60
-            border = "#B71C1C"
-        
-        # Signal housing (black box)
-        fig.add_shape(
-            type="rect",
-            x0=x-0.18, y0=y-0.25, x1=x+0.18, y1=y+0.25,
-            fillcolor="#1a1a1a",
-            line=dict(color="#000000", width=2),
-            layer='below'
-        )
-        
-        # Signal pole (gray)
-        pole_start_y = y - 0.45 if direction in ["NORTH", "SOUTH"] else y
-        pole_end_y = y - 0.25 if direction in ["NORTH", "SOUTH"] else y
-        pole_start_x = x if direction in ["NORTH", "SOUTH"] else x - 0.45 if direction == "EAST" else x + 0.45
-        pole_end_x = x if direction in ["NORTH", "SOUTH"] else x - 0.25 if direction == "EAST" else x + 0.25
-        
-        fig.add_trace(go.Scatter(
-            x=[pole_start_x, pole_end_x],
-            y=[pole_start_y, pole_end_y],
-            mode='lines',
-            line=dict(color='#505050', width=6),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
+        color, glow, size, border = _SIGNAL_STYLE[signal.state]
         
         # Glow effect
         for glow_size in [90, 75, 60]:
-            fig.add_trace(go.Scatter(
-                x=[x], y=[y],
-                mode='markers',
-                marker=dict(size=glow_size, color=glow, opacity=0.25),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
+            glow_x.append(x)
+            glow_y.append(y)
+            glow_sizes.append(glow_size)
+            glow_colors.append(glow)
         
         # Main signal light
-        fig.add_trace(go.Scatter(
-            x=[x], y=[y],
-            mode='markers',
-            marker=dict(
-                size=size,
-                color=color,
-                line=dict(width=4, color=border),
-                symbol='circle'
-            ),
-            name=direction,
-            showlegend=False,
-            hovertemplate=(
-                f"<b style='font-size:14px'>🚦 {direction}</b><br>"
-                f"<b>State:</b> <span style='font-size:13px'>{signal.state.value}</span><br>"
-                f"<b>Cycles:</b> {signal.cycle_count}<br>"
-                f"<b>Time:</b> {time.time() - signal.last_state_change:.1f}s<br>"
-                "<extra></extra>"
-            )
-        ))
-        
-        # Direction arrow on signal
-        fig.add_annotation(
-            x=x, y=y,
-            text=f"<b style='font-size:18px'>{arrow}</b>",
-            showarrow=False,
-            font=dict(color="white", size=18, family="Arial Black"),
-            bgcolor="rgba(0,0,0,0)"
-        )
+        light_x.append(x)
+        light_y.append(y)
+        light_sizes.append(size)
+        light_colors.append(color)
+        light_borders.append(border)
+        light_names.append(direction)
+        light_data.append([signal.cycle_count, time.time() - signal.last_state_change, signal.state.value])
     
     # ========== VEHICLE INDICATORS - Cleaner Design ==========
     
-    vehicle_config = {
-        "NORTH": [(0.2, 2.2), (0.2, 1.9), (0.2, 1.6)],
-        "SOUTH": [(-0.2, -2.2), (-0.2, -1.9), (-0.2, -1.6)],
-        "EAST": [(2.2, -0.2), (1.9, -0.2), (1.6, -0.2)],
-        "WEST": [(-2.2, 0.2), (-1.9, 0.2), (-1.6, 0.2)]
-    }
+    veh_x, veh_y, veh_sizes, veh_colors, veh_symbols = [], [], [], [], []
     
-    for direction, positions in vehicle_config.items():
+    for direction, positions in _VEHICLE_CONFIG.items():
         signal = signal_dict.get(direction)
         if not signal:
             continue
         
-        density = intersection.traffic_density.get(direction, 50)
+        density = intersection.get_traffic_density(direction)
         num_vehicles = min(int((density / 100) * 3), len(positions))
         
         for i in range(num_vehicles):
@@ -610,58 +797,90 @@ def create_intersection_diagram(intersection: Intersection, signals: list):
             elif direction == "WEST":
                 vehicle_symbol = "triangle-right"
             
-            fig.add_trace(go.Scatter(
-                x=[x], y=[y],
-                mode='markers',
-                marker=dict(
-                    size=vehicle_size,
-                    color=vehicle_color,
-                    symbol=vehicle_symbol,
-                    line=dict(width=2, color='#1a1a1a')
-                ),
-                showlegend=False,
-                hovertemplate=f"<b>🚗 Vehicle</b><br>Direction: {direction}<br>Status: {'Moving' if signal.state == SignalState.GREEN else 'Waiting'}<extra></extra>"
-            ))
+            veh_x.append(x)
+            veh_y.append(y)
+            veh_sizes.append(vehicle_size)
+            veh_colors.append(vehicle_color)
+            veh_symbols.append(vehicle_symbol)
     
     # ========== ACTIVE FLOW INDICATORS ==========
     
-    flow_arrows = {
-        "NORTH": (0.25, 1.0, "▼"),
-        "SOUTH": (-0.25, -1.0, "▲"),
-        "EAST": (1.0, -0.25, "◀"),
-        "WEST": (-1.0, 0.25, "▶")
+    active = intersection.active_directions
+    flow_x = [_FLOW_ARROWS[d][0] for d in active if d in _FLOW_ARROWS]
+    flow_y = [_FLOW_ARROWS[d][1] for d in active if d in _FLOW_ARROWS]
+    
+    return {
+        'glow': dict(x=glow_x, y=glow_y, marker=dict(size=glow_sizes, color=glow_colors)),
+        'light': dict(
+            x=light_x, y=light_y,
+            marker=dict(size=light_sizes, color=light_colors, line=dict(color=light_borders)),
+            text=light_names,
+            customdata=light_data
+        ),
+        'vehicle': dict(
+            x=veh_x, y=veh_y,
+            marker=dict(size=veh_sizes, color=veh_colors, symbol=veh_symbols)
+        ),
+        'flow': dict(x=flow_x, y=flow_y),
+        'flow_visible': [d in active for d in _FLOW_ARROWS],
+        'active_text': ", ".join(active) if active else "All RED",
     }
+
+
+def create_intersection_diagram(intersection: Intersection, signals: list):
+    """Create a clean, professional intersection visualization"""
     
-    for direction in intersection.active_directions:
-        if direction in flow_arrows:
-            x, y, arrow = flow_arrows[direction]
-            
-            fig.add_trace(go.Scatter(
-                x=[x], y=[y],
-                mode='markers',
-                marker=dict(
-                    size=50,
-                    color='rgba(76, 175, 80, 0.6)',
-                    symbol='circle',
-                    line=dict(width=0)
-                ),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-            
-            fig.add_annotation(
-                x=x, y=y,
-                text=f"<b style='font-size:24px'>{arrow}</b>",
-                showarrow=False,
-                font=dict(color="#2E7D32", size=24, family="Arial Black")
-            )
+    series = _diagram_series(intersection, signals)
     
-    # ========== STATUS ANNOTATION ==========
+    # Start from a copy of the cached static background
+    fig = go.Figure(_build_static_background())
+    
+    fig.add_trace(go.Scattergl(
+        mode='markers',
+        marker=dict(opacity=0.25),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    
+    fig.add_trace(go.Scattergl(
+        mode='markers',
+        marker=dict(line=dict(width=4), symbol='circle'),
+        showlegend=False,
+        hovertemplate=_SIGNAL_HOVER
+    ))
     
-    active_text = ", ".join(intersection.active_directions) if intersection.active_directions else "All RED"
+    fig.add_trace(go.Scattergl(
+        mode='markers',
+        marker=dict(line=dict(width=2, color='#1a1a1a')),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    
+    fig.add_trace(go.Scattergl(
+        mode='markers',
+        marker=dict(
+            size=50,
+            color='rgba(76, 175, 80, 0.6)',
+            symbol='circle',
+            line=dict(width=0)
+        ),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    
+    # One flow arrow per direction, toggled by visibility so indices stay fixed
+    for x, y, arrow in _FLOW_ARROWS.values():
+        fig.add_annotation(
+            x=x, y=y,
+            text=f"<b style='font-size:24px'>{arrow}</b>",
+            showarrow=False,
+            font=dict(color="#2E7D32", size=24, family="Arial Black"),
+            visible=False
+        )
+    
+    # ========== STATUS ANNOTATION ==========
     
     fig.add_annotation(
-        text=f"<b style='font-size:15px'>Active: {active_text}</b>",
         xref="paper", yref="paper",
         x=0.5, y=1.02,
         showarrow=False,
@@ -672,283 +891,661 @@ def create_intersection_diagram(intersection: Intersection, signals: list):
         borderpad=10
     )
     
-    # ========== LAYOUT ==========
-    
-    fig.update_layout(
-        title={
-            'text': "<b>🚦 Live Intersection Monitor</b>",
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 22, 'color': '#1a1a1a', 'family': 'Inter'}
-        },
-        xaxis=dict(
-            range=[-3.2, 3.2],
-            showgrid=False,
-            zeroline=False,
-            showticklabels=False,
-            scaleanchor="y",
-            scaleratio=1
-        ),
-        yaxis=dict(
-            range=[-3.2, 3.2],
-            showgrid=False,
-            zeroline=False,
-            showticklabels=False
-        ),
-        height=600,
-        showlegend=False,
-        plot_bgcolor='#b3d9ff',  # Light blue sky
-        paper_bgcolor='white',
-        margin=dict(l=20, r=20, t=70, b=20),
-        hovermode='closest'
-    )
-    
+    _apply_diagram_series(fig, series)
     return fig
 
 
-def display_signal_status(signal, intersection):
-    """Display individual signal status with enhanced readability"""
-    state = signal.state
-    
-    if state == SignalState.RED:
-        css_class = "red-signal"
-        emoji = "🔴"
-    elif state == SignalState.YELLOW:
-        css_class = "yellow-signal"
-        emoji = "🟡"
-    elif state == SignalState.GREEN:
-        css_class = "green-signal"
-        emoji = "🟢"
-    else:  # EMERGENCY
-        css_class = "emergency-signal"
-        emoji = "🚨"
-    
-    time_in_state = time.time() - signal.last_state_change
-    density = intersection.traffic_density.get(signal.direction, 0)
-    
-    # Calculate progress bar width for time in state
-    max_time = signal.base_green_time + signal.yellow_time + 2
-    progress = min((time_in_state / max_time) * 100, 100)
-    
-    # Performance rating based on cycle count
-    if signal.cycle_count >= 10:
-        perf_badge = '<span class="perf-badge perf-excellent">⭐ Excellent</span>'
-    elif signal.cycle_count >= 5:
-        perf_badge = '<span class="perf-badge perf-good">✓ Good</span>'
+def _apply_diagram_series(fig: go.Figure, series: dict):
+    """Write dynamic data into the diagram's fixed trace and annotation slots"""
+    fig.data[_GLOW_TRACE].update(series['glow'])
+    fig.data[_LIGHT_TRACE].update(series['light'])
+    fig.data[_VEHICLE_TRACE].update(series['vehicle'])
+    fig.data[_FLOW_TRACE].update(series['flow'])
+    
+    annotations = fig.layout.annotations
+    for offset, visible in enumerate(series['flow_visible']):
+        annotations[_FLOW_ANNOTATION + offset].visible = visible
+    annotations[_STATUS_ANNOTATION].text = f"<b style='font-size:15px'>Active: {series['active_text']}</b>"
+
+
+def update_intersection_diagram(fig: go.Figure, intersection: Intersection, signals: list):
+    """Patch the current signal, vehicle and flow data into an existing diagram"""
+    _apply_diagram_series(fig, _diagram_series(intersection, signals))
+
+
+def persistent_intersection_diagram(intersection: Intersection, signals: list) -> go.Figure:
+    """Build the intersection diagram once per session, then update it in place"""
+    fig = st.session_state.get("diagram_figure")
+    if fig is None:
+        fig = create_intersection_diagram(intersection, signals)
+        st.session_state.diagram_figure = fig
     else:
-        perf_badge = '<span class="perf-badge perf-fair">○ Fair</span>'
-    
-    st.markdown(f"""
-        <div class="signal-box {css_class}">
-            <div style="font-size: 2.5rem; margin-bottom: 0.8rem;">{emoji}</div>
+        update_intersection_diagram(fig, intersection, signals)
+    return fig
+
+
+# Signal status card; only the $-fields change between reruns
+_SIGNAL_TEMPLATE = string.Template("""
+        <div class="signal-box $css_class">
+            <div style="font-size: 2.5rem; margin-bottom: 0.8rem;">$emoji</div>
             <div class="signal-box-title">
-                {signal.direction}
+                $direction
             </div>
             <div class="signal-box-state">
-                {state.value}
+                $state
             </div>
             <div class="signal-box-info">
                 <div class="signal-box-metric">
-                    <span style="font-weight: 700;">⏱️ Time:</span> {time_in_state:.1f}s
+                    <span style="font-weight: 700;">⏱️ Time:</span> ${time_in_state}s
                 </div>
                 <div class="signal-box-metric">
-                    <span style="font-weight: 700;">🔄 Cycles:</span> {signal.cycle_count}
+                    <span style="font-weight: 700;">🔄 Cycles:</span> $cycles
                 </div>
                 <div style="background: rgba(0,0,0,0.15); height: 8px; border-radius: 4px; overflow: hidden; margin: 0.8rem 0;">
-                    <div style="background: linear-gradient(90deg, #4caf50, #ffeb3b, #f44336); height: 100%; width: {progress}%; transition: width 0.3s;"></div>
+                    <div style="background: linear-gradient(90deg, #4caf50, #ffeb3b, #f44336); height: 100%; width: ${progress}%; transition: width 0.3s;"></div>
                 </div>
                 <div class="signal-box-metric">
-                    <span style="font-weight: 700;">🚗 Traffic:</span> {density}%
+                    <span style="font-weight: 700;">🚗 Traffic:</span> ${density}%
                 </div>
                 <div style="margin-top: 0.8rem;">
-                    {perf_badge}
+                    $perf_badge
                 </div>
             </div>
         </div>
-    """, unsafe_allow_html=True)
+    """)
+
+# Traffic flow card shown under the intersection diagram
+_FLOW_TEMPLATE = string.Template("""
+                        <div class="traffic-flow">
+                            <div class="traffic-flow-title">$icon $direction</div>
+                            <div class="traffic-flow-status" style="color: $color;">$status</div>
+                            <div class="traffic-flow-load">Load: <b>${density}%</b></div>
+                            <div style="background: #e0e0e0; height: 10px; border-radius: 5px; overflow: hidden;">
+                                <div class="flow-bar" style="width: ${density}%;"></div>
+                            </div>
+                        </div>
+                    """)
 
+# Performance insight card (efficiency, fairness, safety)
+_INSIGHT_TEMPLATE = string.Template("""
+            <div class="metric-card">
+                <h4>$title</h4>
+                <div style="font-size: 2rem; font-weight: 700; color: $color; margin: 1rem 0;">
+                    ${value}%
+                </div>
+                <div style="font-size: 0.9rem; color: #666;">
+                    $caption
+                </div>
+            </div>
+        """)
 
-def create_statistics_charts(controller: TrafficController):
-    """Create enhanced statistics visualization charts"""
+# One cell of the top metrics row (styled like st.metric)
+_METRIC_CELL_TEMPLATE = string.Template(
+    '<div class="metric-cell">'
+    '<div class="metric-cell-label">$label</div>'
+    '<div class="metric-cell-value">$value</div>'
+    '<div class="metric-cell-delta">$delta</div>'
+    '</div>'
+)
+
+# Sidebar runtime clock
+_RUNTIME_TEMPLATE = string.Template("""
+                    <div style="background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%); padding: 1rem; border-radius: 10px; margin-bottom: 1rem;">
+                        <div style="font-size: 0.9rem; color: #666;">Runtime</div>
+                        <div style="font-size: 1.5rem; font-weight: 700; color: #333;">
+                            $runtime
+                        </div>
+                    </div>
+                """)
+
+
+def display_signal_status(signal, intersection):
+    """Display individual signal status with enhanced readability"""
+    state = signal.state
+    css_class, emoji = _STATE_META[state]
     
-    if not controller.intersections:
-        return None, None, None, None
+    time_in_state = time.time() - signal.last_state_change
+    density = intersection.get_traffic_density(signal.direction)
+    
+    # Calculate progress bar width for time in state
+    max_time = signal.base_green_time + signal.yellow_time + 2
+    progress = min((time_in_state / max_time) * 100, 100)
     
+    # Performance rating based on cycle count
+    if signal.cycle_count >= 10:
+        perf_badge = '<span class="perf-badge perf-excellent">⭐ Excellent</span>'
+    elif signal.cycle_count >= 5:
+        perf_badge = '<span class="perf-badge perf-good">✓ Good</span>'
+    else:
+        perf_badge = '<span class="perf-badge perf-fair">○ Fair</span>'
+    
+    st.markdown(_SIGNAL_TEMPLATE.substitute(
+        css_class=css_class,
+        emoji=emoji,
+        direction=signal.direction,
+        state=state.value,
+        time_in_state=f"{time_in_state:.1f}",
+        cycles=signal.cycle_count,
+        progress=progress,
+        density=density,
+        perf_badge=perf_badge
+    ), unsafe_allow_html=True)
+
+
+# Signal state colours for the state distribution chart
+_STATE_COLORS = {'RED': '#f44336', 'YELLOW': '#ffeb3b', 'GREEN': '#4caf50', 'EMERGENCY': '#e91e63'}
+
+
+def _statistics_series(controller: TrafficController) -> dict:
+    """
+    Collect the data plotted by the statistics charts
+    
+    Charts only have one point per direction, so plain lists are passed
+    straight to Plotly instead of building a DataFrame per chart.
+    """
     intersection = controller.intersections[0]
-    signals = [s for s in controller.signals if s.intersection == intersection]
+    signals = controller.signals_at(0)
     
-    # ========== CHART 1: Traffic Density Gauge ==========
-    density_data = []
-    for direction in ["NORTH", "SOUTH", "EAST", "WEST"]:
-        density = intersection.traffic_density.get(direction, 0)
-        density_data.append({
-            "Direction": direction,
-            "Density": density,
-            "Status": "Heavy" if density > 66 else "Moderate" if density > 33 else "Light"
-        })
+    directions = ["NORTH", "SOUTH", "EAST", "WEST"]
+    densities = [intersection.get_traffic_density(d) for d in directions]
+    
+    state_counts = dict.fromkeys(_STATE_COLORS, 0)
+    for signal in signals:
+        state = signal.state.value.split()[1]  # Get just the color name
+        state_counts[state] = state_counts.get(state, 0) + 1
     
-    df_density = pd.DataFrame(density_data)
+    signal_dirs = [s.direction for s in signals]
+    stats = controller.intersection_stats(0)
+    avg_wait = stats.total_wait_time / max(stats.total_cycles, 1)
+    
+    return {
+        'directions': directions,
+        'densities': densities,
+        'density_colors': ['#4caf50' if d < 33 else '#ffeb3b' if d < 66 else '#f44336'
+                           for d in densities],
+        'signal_dirs': signal_dirs,
+        'cycles': [s.cycle_count for s in signals],
+        'num_signals': len(signals),
+        'state_counts': state_counts,
+        'wait_x': signal_dirs,
+        'wait_y': [avg_wait] * len(signals),
+    }
+
+
+# Analytics panels as (row, col) cells of one 2x2 subplot figure
+_STATS_TITLES = (
+    "🚗 Traffic Density by Direction", "🔄 Signal Cycles Completed",
+    "🎯 Current Signal Distribution", "⏱️ Average Wait Time"
+)
+_DENSITY_CELL, _CYCLES_CELL, _TIMELINE_CELL, _WAIT_CELL = (1, 1), (1, 2), (2, 1), (2, 2)
+
+# Layout and per-panel axes never change between ticks, so they are built once at import
+_STATS_LAYOUT = dict(
+    **_LIVE_FIGURE_LAYOUT,
+    width=900,  # Fits the main column beside an open sidebar on a 1440 px screen
+    height=600,
+    autosize=False,
+    showlegend=False,
+    plot_bgcolor='rgba(0,0,0,0.02)',
+    paper_bgcolor='white',
+    margin=dict(t=50, b=50)
+)
+_STATS_YAXES = {
+    _DENSITY_CELL: dict(title="Density (%)", range=[0, 110], gridcolor='rgba(0,0,0,0.1)'),
+    _CYCLES_CELL: dict(title="Number of Cycles", gridcolor='rgba(0,0,0,0.1)'),
+    _TIMELINE_CELL: dict(title="Signals", dtick=1, gridcolor='rgba(0,0,0,0.1)'),
+    _WAIT_CELL: dict(title="Seconds", gridcolor='rgba(0,0,0,0.1)'),
+}
+
+
+def create_statistics_charts(controller: TrafficController):
+    """Create the analytics dashboard as a single 2x2 subplot figure"""
     
-    fig_density = go.Figure()
+    if not controller.intersections:
+        return None
     
-    # Add bars with gradient colors
-    colors = ['#4caf50' if d < 33 else '#ffeb3b' if d < 66 else '#f44336' 
-              for d in df_density['Density']]
+    series = _statistics_series(controller)
+    
+    fig = make_subplots(rows=2, cols=2, subplot_titles=_STATS_TITLES,
+                        vertical_spacing=0.15, horizontal_spacing=0.1)
     
-    fig_density.add_trace(go.Bar(
-        x=df_density['Direction'],
-        y=df_density['Density'],
+    # ========== CHART 1: Traffic Density Gauge ==========
+    densities = series['densities']
+    
+    # Add bars with gradient colors
+    fig.add_trace(go.Bar(
+        x=series['directions'],
+        y=densities,
         marker=dict(
-            color=colors,
+            color=series['density_colors'],
             line=dict(color='#333', width=2)
         ),
-        text=df_density['Density'].apply(lambda x: f"{x}%"),
+        text=[f"{d}%" for d in densities],
         textposition='outside',
         hovertemplate='<b>%{x}</b><br>Density: %{y}%<br><extra></extra>'
-    ))
-    
-    fig_density.update_layout(
-        title={
-            'text': "🚗 Traffic Density by Direction",
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 16, 'color': '#333'}
-        },
-        yaxis_title="Density (%)",
-        height=300,
-        plot_bgcolor='rgba(0,0,0,0.02)',
-        paper_bgcolor='white',
-        yaxis=dict(range=[0, 110], gridcolor='rgba(0,0,0,0.1)'),
-        margin=dict(t=50, b=50)
-    )
+    ), *_DENSITY_CELL)
     
     # ========== CHART 2: Signal Performance (Cycles) ==========
-    cycle_data = pd.DataFrame([
-        {
-            "Direction": s.direction,
-            "Cycles": s.cycle_count,
-            "Avg_Wait": intersection.stats.total_wait_time / max(s.cycle_count, 1)
-        }
-        for s in signals
-    ])
-    
-    fig_cycles = go.Figure()
+    cycles = series['cycles']
     
-    fig_cycles.add_trace(go.Bar(
-        x=cycle_data['Direction'],
-        y=cycle_data['Cycles'],
+    fig.add_trace(go.Bar(
+        x=series['signal_dirs'],
+        y=cycles,
         name='Cycles',
         marker=dict(
-            color=cycle_data['Cycles'],
+            color=cycles,
             colorscale='Greens',
             line=dict(color='#1b5e20', width=2),
             showscale=True,
-            colorbar=dict(title="Cycles", len=0.5)
+            # Beside the top-right panel rather than the whole figure
+            colorbar=dict(title="Cycles", len=0.4, y=0.8)
         ),
-        text=cycle_data['Cycles'],
+        text=cycles,
         textposition='outside',
         hovertemplate='<b>%{x}</b><br>Cycles: %{y}<br><extra></extra>'
-    ))
+    ), *_CYCLES_CELL)
     
-    fig_cycles.update_layout(
-        title={
-            'text': "🔄 Signal Cycles Completed",
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 16, 'color': '#333'}
-        },
-        yaxis_title="Number of Cycles",
-        height=300,
-        plot_bgcolor='rgba(0,0,0,0.02)',
-        paper_bgcolor='white',
-        yaxis=dict(gridcolor='rgba(0,0,0,0.1)'),
-        margin=dict(t=50, b=50)
+    # ========== CHART 3: System Performance Timeline ==========
+    # Bar chart of current states (a pie is needlessly expensive for 4 signals)
+    state_counts = series['state_counts']
+    
+    fig.add_trace(go.Bar(
+        x=list(state_counts.keys()),
+        y=list(state_counts.values()),
+        marker=dict(
+            color=[_STATE_COLORS.get(k, '#999') for k in state_counts.keys()],
+            line=dict(color='#333', width=2)
+        ),
+        text=list(state_counts.values()),
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>Count: %{y}<br><extra></extra>'
+    ), *_TIMELINE_CELL)
+    
+    # ========== CHART 4: Wait Time Analysis ==========
+    # WebGL trace: drawn on a canvas instead of re-laid-out SVG paths
+    fig.add_trace(go.Scattergl(
+        x=series['wait_x'],
+        y=series['wait_y'],
+        mode='lines+markers',
+        marker=dict(size=15, color='#667eea', line=dict(color='#333', width=2)),
+        line=dict(color='#667eea', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(102, 126, 234, 0.2)',
+        hovertemplate='<b>%{x}</b><br>Avg Wait: %{y:.2f}s<br><extra></extra>'
+    ), *_WAIT_CELL)
+    
+    fig.update_layout(_STATS_LAYOUT)
+    fig.update_annotations(font=dict(size=16, color='#333'))
+    for (row, col), yaxis in _STATS_YAXES.items():
+        fig.update_yaxes(yaxis, row=row, col=col)
+    fig.update_yaxes(range=[0, series['num_signals'] + 1], row=_TIMELINE_CELL[0], col=_TIMELINE_CELL[1])
+    fig.update_xaxes(gridcolor='rgba(0,0,0,0.1)', row=_WAIT_CELL[0], col=_WAIT_CELL[1])
+    
+    return fig
+
+
+def update_statistics_charts(fig: go.Figure, controller: TrafficController):
+    """
+    Patch fresh data into the analytics figure in place
+    
+    Only trace data is touched; the layout built by create_statistics_charts
+    is left alone so the frontend does not have to recompute it.
+    
+    Args:
+        fig: Figure returned by create_statistics_charts
+        controller: Controller to read the current statistics from
+    """
+    density_trace, cycles_trace, timeline_trace, wait_trace = fig.data
+    series = _statistics_series(controller)
+    
+    densities = series['densities']
+    density_trace.update(
+        y=densities,
+        text=[f"{d}%" for d in densities],
+        marker_color=series['density_colors']
     )
     
-    # ========== CHART 3: System Performance Timeline ==========
-    fig_timeline = go.Figure()
+    cycles = series['cycles']
+    cycles_trace.update(x=series['signal_dirs'], y=cycles, text=cycles, marker_color=cycles)
     
-    # Create timeline data
-    timeline_data = []
-    for signal in signals:
-        timeline_data.append({
-            'Direction': signal.direction,
-            'Cycles': signal.cycle_count,
-            'State': signal.state.value
-        })
-    
-    # Pie chart of current states
-    state_counts = {}
-    for signal in signals:
-        state = signal.state.value.split()[1]  # Get just the color name
-        state_counts[state] = state_counts.get(state, 0) + 1
+    counts = list(series['state_counts'].values())
+    timeline_trace.update(y=counts, text=counts)
     
-    colors_map = {'RED': '#f44336', 'YELLOW': '#ffeb3b', 'GREEN': '#4caf50', 'EMERGENCY': '#e91e63'}
+    wait_trace.update(x=series['wait_x'], y=series['wait_y'])
+
+
+def persistent_statistics_charts(controller: TrafficController) -> go.Figure:
+    """Build the analytics figure once per session, then update it in place"""
+    fig = st.session_state.get("stats_figure")
+    if fig is None:
+        fig = create_statistics_charts(controller)
+        st.session_state.stats_figure = fig
+    else:
+        update_statistics_charts(fig, controller)
+    return fig
+
+
+def cached_figure(name: str, signature: Hashable, build):
+    """
+    Reuse the figure(s) built on a previous rerun while their inputs are unchanged
     
-    fig_timeline.add_trace(go.Pie(
-        labels=list(state_counts.keys()),
-        values=list(state_counts.values()),
-        marker=dict(colors=[colors_map.get(k, '#999') for k in state_counts.keys()]),
-        hole=0.4,
-        textinfo='label+percent',
-        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-    ))
+    Args:
+        name: Session-state slot for this figure
+        signature: Hashable summary of the figure's dynamic inputs, usually
+            the controller's state_version
+        build: Zero-argument callable that builds the figure(s)
+        
+    Returns:
+        The cached figure(s) if the signature matches, else freshly built ones
+    """
+    cache = st.session_state.setdefault("figure_cache", {})
     
-    fig_timeline.update_layout(
-        title={
-            'text': "🎯 Current Signal Distribution",
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 16, 'color': '#333'}
-        },
-        height=300,
-        paper_bgcolor='white',
-        showlegend=True,
-        margin=dict(t=50, b=20)
+    cached = cache.get(name)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    figure = build()
+    cache[name] = (signature, figure)
+    return figure
+
+
+@st.fragment(run_every=1.0)
+def live_metrics():
+    """Top metrics row, refreshed on its own without rerunning the whole app"""
+    controller = st.session_state.controller
+    intersection = controller.intersections[0]
+    
+    # ========== TOP METRICS ROW ==========
+    stats = controller.get_system_stats()
+    
+    vehicles_delta = stats['vehicles_passed'] - st.session_state.get("prev_vehicles_passed", 0)
+    green_count = int((controller.states[controller.signal_slice(0)] == STATE_CODES[SignalState.GREEN]).sum())
+    
+    active_count = len(intersection.active_directions)
+    
+    cells = (
+        ("🔄 Total Cycles", stats['total_cycles'], f"+{green_count} active"),
+        ("⏱️ Avg Wait", stats['average_wait_time'], "Live"),
+        ("🚑 Emergencies", stats['emergency_responses'], "Handled"),
+        ("🛡️ Deadlocks Prevented", stats['deadlock_preventions'], "Protected"),
+        ("🚗 Vehicles Passed", stats['vehicles_passed'], f"+{vehicles_delta} since last update"),
+        ("🚦 Active Signals", f"{active_count}/4", "Live"),
     )
     
-    # ========== CHART 4: Wait Time Analysis ==========
-    wait_data = []
-    for signal in signals:
-        avg_wait = intersection.stats.total_wait_time / max(intersection.stats.total_cycles, 1)
-        wait_data.append({
-            'Direction': signal.direction,
-            'Avg_Wait': avg_wait,
-            'Cycles': signal.cycle_count
-        })
+    # One markdown element for the whole row instead of six st.metric components
+    st.markdown(
+        '<div class="metrics-grid">'
+        + "".join(_METRIC_CELL_TEMPLATE.substitute(label=label, value=value, delta=delta)
+                  for label, value, delta in cells)
+        + '</div>',
+        unsafe_allow_html=True
+    )
     
-    df_wait = pd.DataFrame(wait_data)
+    st.session_state.prev_vehicles_passed = stats['vehicles_passed']
+
+
+@st.fragment(run_every=1)
+def live_intersection_view():
+    """Intersection diagram, flow analysis and signal cards"""
+    controller = st.session_state.controller
+    intersection = controller.intersections[0]
+    signals = controller.signals_at(0)
     
-    fig_wait = go.Figure()
+    # ========== MAIN VISUALIZATION AREA ==========
     
-    fig_wait.add_trace(go.Scatter(
-        x=df_wait['Direction'],
-        y=df_wait['Avg_Wait'],
-        mode='lines+markers',
-        marker=dict(size=15, color='#667eea', line=dict(color='#333', width=2)),
-        line=dict(color='#667eea', width=3),
-        fill='tozeroy',
-        fillcolor='rgba(102, 126, 234, 0.2)',
-        hovertemplate='<b>%{x}</b><br>Avg Wait: %{y:.2f}s<br><extra></extra>'
-    ))
+    col_main_left, col_main_right = st.columns([2, 1])
     
-    fig_wait.update_layout(
-        title={
-            'text': "⏱️ Average Wait Time",
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 16, 'color': '#333'}
-        },
-        yaxis_title="Seconds",
-        height=300,
-        plot_bgcolor='rgba(0,0,0,0.02)',
-        paper_bgcolor='white',
-        yaxis=dict(gridcolor='rgba(0,0,0,0.1)'),
-        xaxis=dict(gridcolor='rgba(0,0,0,0.1)'),
-        margin=dict(t=50, b=50)
+    with col_main_left:
+        # Enhanced intersection diagram
+        fig_intersection = cached_figure(
+            "intersection",
+            controller.state_version,
+            lambda: persistent_intersection_diagram(intersection, signals)
+        )
+        st.plotly_chart(fig_intersection, use_container_width=False, config=_CHART_CONFIG, key="intersection_viz")
+        
+        # Traffic flow summary
+        st.markdown("### 📊 Traffic Flow Analysis")
+        
+        flow_cols = st.columns(4)
+        for idx, direction in enumerate(["NORTH", "SOUTH", "EAST", "WEST"]):
+            with flow_cols[idx]:
+                signal = controller.get_signal(0, direction)
+                density = intersection.get_traffic_density(direction)
+                
+                # Determine flow status
+                if signal.state == SignalState.GREEN:
+                    flow_status = "FLOWING"
+                    flow_color = "#4caf50"
+                    flow_icon = "🟢"
+                elif signal.state == SignalState.YELLOW:
+                    flow_status = "SLOWING"
+                    flow_color = "#ffeb3b"
+                    flow_icon = "🟡"
+                else:
+                    flow_status = "STOPPED"
+                    flow_color = "#f44336"
+                    flow_icon = "🔴"
+                
+                st.markdown(_FLOW_TEMPLATE.substitute(
+                    icon=flow_icon,
+                    direction=direction,
+                    color=flow_color,
+                    status=flow_status,
+                    density=density
+                ), unsafe_allow_html=True)
+
+    with col_main_right:
+        # Signal status cards
+        st.markdown("### 🚦 Signal Status")
+        for signal in signals:
+            display_signal_status(signal, intersection)
+        
+        # Active directions summary
+        st.markdown("### ✅ Active Lanes")
+        if intersection.active_directions:
+            for direction in intersection.active_directions:
+                st.success(f"🟢 **{direction}** - GREEN LIGHT")
+        else:
+            st.info("🔴 All signals at RED")
+
+
+@st.fragment(run_every="0.5s")
+def live_dashboard():
+    """Analytics charts, performance insights and the event log"""
+    controller = st.session_state.controller
+    intersection = controller.intersections[0]
+    stats = controller.get_system_stats()
+    
+    # ========== ANALYTICS DASHBOARD ==========
+    
+    st.markdown("### 📈 System Analytics Dashboard")
+    
+    fig_statistics = cached_figure(
+        "statistics",
+        controller.state_version,
+        lambda: persistent_statistics_charts(controller)
+    )
+    
+    # One figure for all four panels: a single chart element to mount and update
+    st.plotly_chart(fig_statistics, use_container_width=False, config=_CHART_CONFIG, key="chart_statistics")
+    
+    st.divider()
+    
+    # ========== PERFORMANCE INSIGHTS ==========
+    
+    st.markdown("### 💡 Performance Insights")
+    
+    cycle_counts = controller.cycle_counts[controller.signal_slice(0)]
+    
+    # Efficiency rating
+    avg_cycles = cycle_counts.mean() if cycle_counts.size else 0
+    efficiency = min(100, (avg_cycles / max(1, (datetime.now() - st.session_state.start_time).seconds / 10)) * 100)
+    
+    # Fairness score: 100 minus the (population) std-dev of cycle counts
+    fairness = max(0, 100 - cycle_counts.std()) if cycle_counts.size else 100
+    
+    # Safety rating
+    safety = max(0, 100 - (stats['deadlock_preventions'] * 2))
+    
+    cards = (
+        _INSIGHT_TEMPLATE.substitute(
+            title="⚡ System Efficiency",
+            color="#4caf50",
+            value=f"{efficiency:.1f}",
+            caption="Based on cycle completion rate"
+        ),
+        _INSIGHT_TEMPLATE.substitute(
+            title="⚖️ Fairness Score",
+            color="#667eea",
+            value=f"{fairness:.1f}",
+            caption="Distribution balance across signals"
+        ),
+        _INSIGHT_TEMPLATE.substitute(
+            title="🛡️ Safety Rating",
+            color="#f44336",
+            value=f"{safety:.1f}",
+            caption="Conflict avoidance effectiveness"
+        ),
+    )
+    
+    # Cards are stripped so no whitespace-only line ends the HTML block early
+    st.markdown(
+        '<div class="insights-grid">\n'
+        + "\n".join(card.strip() for card in cards)
+        + '\n</div>',
+        unsafe_allow_html=True
+    )
+    
+    st.divider()
+    
+    # ========== EVENT LOG ==========
+    
+    col_log_header, col_log_download = st.columns([3, 1])
+    
+    with col_log_header:
+        st.markdown("### 📝 System Event Log")
+    
+    with col_log_download:
+        st.markdown("<div style='padding-top: 0.5rem;'></div>", unsafe_allow_html=True)
+        # Placeholder for download button
+    
+    # Single slot for the terminal, updated in place whether it shows the
+    # log or the "no events" notice
+    log_placeholder = st.empty()
+    
+    new_events, st.session_state.events_seen = intersection.events_since(
+        st.session_state.events_seen
+    )
+    
+    # Keep a bounded history so the log and CSV export survive across reruns
+    events = st.session_state.event_history
+    events.extend(new_events)
+    
+    if st.session_state.get("persist_log"):
+        append_events_to_file(new_events)
+    
+    if events:
+        # Display last 20 events in styled terminal
+        event_text = "\n".join(islice(events, max(len(events) - 20, 0), None))
+        log_placeholder.markdown(f"""
+            <div class="event-log">
+                <pre style="margin: 0; color: #0f0; font-size: 1rem; line-height: 1.6;">{event_text}</pre>
+            </div>
+        """, unsafe_allow_html=True)
+        
+        # Add CSV download button
+        with col_log_download:
+            # The history only grows within a run, so (run start, events seen)
+            # identifies its contents without hashing them
+            create_download_button_for_logs(
+                events, (st.session_state.start_time, st.session_state.events_seen)
+            )
+    else:
+        log_placeholder.info("📭 No events logged yet. System is initializing...")
+
+
+@st.fragment(run_every=1.0)
+def runtime_clock():
+    """Sidebar runtime clock, re-formatted only when the shown second changes"""
+    start_time = st.session_state.start_time
+    if not start_time:
+        return
+    
+    elapsed = int((datetime.now() - start_time).total_seconds())
+    if elapsed != st.session_state.get("last_runtime_s"):
+        hours, remainder = divmod(elapsed, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        st.session_state.last_runtime_html = _RUNTIME_TEMPLATE.substitute(
+            runtime=f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        )
+        st.session_state.last_runtime_s = elapsed
+    
+    st.markdown(st.session_state.last_runtime_html, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def _status_html(running: bool) -> str:
+    """Sidebar status indicator markup; only two variants ever exist"""
+    if running:
+        status_class = "status-running"
+        status_text = "RUNNING"
+    else:
+        status_class = "status-stopped"
+        status_text = "STOPPED"
+    
+    return f"""
+        <div style="text-align: center; padding: 1rem; background: white; border-radius: 10px; margin-bottom: 1rem; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
+            <span class="status-indicator {status_class}"></span>
+            <span style="font-weight: 600; font-size: 1.1rem;">{status_text}</span>
+        </div>
+    """
+
+
+@st.cache_resource
+def _welcome_html() -> str:
+    """Static welcome screen (feature cards and guides) as one HTML blob"""
+    features = (
+        ("🧵", "Multi-threading", "4 independent signal threads running concurrently"),
+        ("🔒", "Synchronization", "Mutex, Semaphore & Condition Variables"),
+        ("🚨", "Priority Scheduling", "Emergency vehicle preemption system"),
+        ("🛡️", "Deadlock Prevention", "Multiple prevention strategies"),
+    )
+    cards = "\n".join(
+        f'''<div class="metric-card">
+<div style="font-size: 2rem; text-align: center;">{icon}</div>
+<h3 style="text-align: center; color: #667eea;">{title}</h3>
+<p style="text-align: center; font-size: 0.9rem;">{text}</p>
+</div>'''
+        for icon, title, text in features
     )
     
-    return fig_density, fig_cycles, fig_timeline, fig_wait
+    return f"""<div class="feature-grid">
+{cards}
+</div>
+<hr>
+<div class="guide-grid">
+<div>
+<h3>🎯 Quick Start Guide</h3>
+<ol>
+<li><b>Start System</b>: Click START button in sidebar</li>
+<li><b>Observe</b>: Watch signals synchronize automatically</li>
+<li><b>Test Emergency</b>: Try the emergency vehicle feature</li>
+<li><b>Adjust Load</b>: Modify traffic density sliders</li>
+<li><b>Monitor</b>: View real-time statistics and logs</li>
+</ol>
+</div>
+<div>
+<h3>📊 What You'll See</h3>
+<ul>
+<li><b>Live Intersection</b>: Visual traffic signal representation</li>
+<li><b>Signal Status</b>: Real-time state of each direction</li>
+<li><b>Analytics</b>: Traffic density and performance metrics</li>
+<li><b>Event Log</b>: Detailed system activity stream</li>
+<li><b>Statistics</b>: Comprehensive performance data</li>
+</ul>
+</div>
+</div>"""
 
 
 def main():
@@ -966,19 +1563,7 @@ def main():
     # ========== SIDEBAR CONTROLS ==========
     with st.sidebar:
         # System status indicator
-        if st.session_state.running:
-            status_class = "status-running"
-            status_text = "RUNNING"
-        else:
-            status_class = "status-stopped"
-            status_text = "STOPPED"
-        
-        st.markdown(f"""
-            <div style="text-align: center; padding: 1rem; background: white; border-radius: 10px; margin-bottom: 1rem; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
-                <span class="status-indicator {status_class}"></span>
-                <span style="font-weight: 600; font-size: 1.1rem;">{status_text}</span>
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_status_html(st.session_state.running), unsafe_allow_html=True)
         
         st.markdown("### 🎛️ System Control")
         
@@ -987,10 +1572,18 @@ def main():
         with col1:
             start_clicked = st.button("▶️ START", disabled=st.session_state.running, type="primary", use_container_width=True)
             if start_clicked:
-                st.session_state.controller = TrafficController(num_intersections=1)
-                st.session_state.controller.start()
+                # One controller per browser session, held by reference in
+                # session_state so reruns and fragment reruns reuse it
+                controller = TrafficController(num_intersections=1)
+                controller.start()
+                st.session_state.controller = controller
                 st.session_state.running = True
                 st.session_state.start_time = datetime.now()
+                st.session_state.event_history.clear()
+                st.session_state.events_seen = 0
+                st.session_state.prev_vehicles_passed = 0
+                # A fresh controller restarts its state_version from zero
+                st.session_state.pop("figure_cache", None)
                 st.success("✅ System Started!")
                 time.sleep(0.5)
                 st.rerun()
@@ -998,8 +1591,9 @@ def main():
         with col2:
             stop_clicked = st.button("⏹️ STOP", disabled=not st.session_state.running, type="secondary", use_container_width=True)
             if stop_clicked:
-                if st.session_state.controller:
-                    st.session_state.controller.stop()
+                controller = st.session_state.controller
+                if controller:
+                    controller.stop()
                 st.session_state.running = False
                 st.warning("⏸️ System Stopped")
                 time.sleep(0.5)
@@ -1009,6 +1603,8 @@ def main():
         
         # Emergency controls
         if st.session_state.running:
+            controller = st.session_state.controller
+            
             st.markdown("### 🚨 Emergency Vehicle")
             st.caption("Trigger priority scheduling")
             
@@ -1019,7 +1615,7 @@ def main():
             )
             
             if st.button("🚑 Dispatch Emergency Vehicle", type="primary", use_container_width=True):
-                st.session_state.controller.trigger_emergency(0, emergency_direction)
+                controller.trigger_emergency(0, emergency_direction)
                 st.success(f"🚨 Emergency vehicle dispatched from {emergency_direction}!")
                 time.sleep(0.5)
                 st.rerun()
@@ -1031,34 +1627,36 @@ def main():
             st.caption("Adjust traffic load for adaptive timing")
             
             with st.expander("Adjust Traffic Density", expanded=False):
-                for direction in ["NORTH", "SOUTH", "EAST", "WEST"]:
-                    density = st.slider(
-                        f"{direction}",
-                        0, 100, 
-                        st.session_state.controller.intersections[0].traffic_density.get(direction, 50),
-                        key=f"density_{direction}",
-                        help=f"Current: {st.session_state.controller.intersections[0].traffic_density.get(direction, 50)}%"
-                    )
-                    st.session_state.controller.update_traffic_density(0, direction, density)
+                # Sliders only take effect on Apply, as one batched update
+                with st.form("density_form", border=False):
+                    intersection = controller.intersections[0]
+                    densities = {}
+                    for direction in ["NORTH", "SOUTH", "EAST", "WEST"]:
+                        current = intersection.get_traffic_density(direction)
+                        densities[direction] = st.slider(
+                            f"{direction}",
+                            0, 100, 
+                            current,
+                            key=f"density_{direction}",
+                            help=f"Current: {current}%"
+                        )
+                    
+                    if st.form_submit_button("Apply", use_container_width=True):
+                        controller.update_traffic_densities(0, densities)
             
             st.divider()
             
             # System info
             st.markdown("### ℹ️ System Information")
             
-            if st.session_state.start_time:
-                runtime = datetime.now() - st.session_state.start_time
-                hours, remainder = divmod(runtime.seconds, 3600)
-                minutes, seconds = divmod(remainder, 60)
-                
-                st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%); padding: 1rem; border-radius: 10px; margin-bottom: 1rem;">
-                        <div style="font-size: 0.9rem; color: #666;">Runtime</div>
-                        <div style="font-size: 1.5rem; font-weight: 700; color: #333;">
-                            {hours:02d}:{minutes:02d}:{seconds:02d}
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
+            st.checkbox(
+                "💾 Save full event log to disk",
+                key="persist_log",
+                help=f"The in-app log keeps the last {_EVENT_HISTORY_LEN} events; "
+                     f"this also appends every event to {_EVENT_LOG_FILE}"
+            )
+            
+            runtime_clock()
             
             # OS Concepts badge
             st.markdown("""
@@ -1090,303 +1688,22 @@ def main():
         # Welcome screen with feature showcase
         st.info("👈 **Click START in the sidebar to begin the simulation**")
         
-        # Feature cards
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.markdown("""
-                <div class="metric-card">
-                    <div style="font-size: 2rem; text-align: center;">🧵</div>
-                    <h3 style="text-align: center; color: #667eea;">Multi-threading</h3>
-                    <p style="text-align: center; font-size: 0.9rem;">4 independent signal threads running concurrently</p>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("""
-                <div class="metric-card">
-                    <div style="font-size: 2rem; text-align: center;">🔒</div>
-                    <h3 style="text-align: center; color: #667eea;">Synchronization</h3>
-                    <p style="text-align: center; font-size: 0.9rem;">Mutex, Semaphore & Condition Variables</p>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown("""
-                <div class="metric-card">
-                    <div style="font-size: 2rem; text-align: center;">🚨</div>
-                    <h3 style="text-align: center; color: #667eea;">Priority Scheduling</h3>
-                    <p style="text-align: center; font-size: 0.9rem;">Emergency vehicle preemption system</p>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            st.markdown("""
-                <div class="metric-card">
-                    <div style="font-size: 2rem; text-align: center;">🛡️</div>
-                    <h3 style="text-align: center; color: #667eea;">Deadlock Prevention</h3>
-                    <p style="text-align: center; font-size: 0.9rem;">Multiple prevention strategies</p>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        st.divider()
-        
-        # Quick guide
-        col_a, col_b = st.columns(2)
-        
-        with col_a:
-            st.markdown("### 🎯 Quick Start Guide")
-            st.markdown("""
-                1. **Start System**: Click START button in sidebar
-                2. **Observe**: Watch signals synchronize automatically
-                3. **Test Emergency**: Try the emergency vehicle feature
-                4. **Adjust Load**: Modify traffic density sliders
-                5. **Monitor**: View real-time statistics and logs
-            """)
-        
-        with col_b:
-            st.markdown("### 📊 What You'll See")
-            st.markdown("""
-                - **Live Intersection**: Visual traffic signal representation
-                - **Signal Status**: Real-time state of each direction
-                - **Analytics**: Traffic density and performance metrics
-                - **Event Log**: Detailed system activity stream
-                - **Statistics**: Comprehensive performance data
-            """)
+        st.markdown(_welcome_html(), unsafe_allow_html=True)
     
     else:
         # ========== LIVE SYSTEM DISPLAY ==========
+        # Each section refreshes inside its own fragment, so the header,
+        # sidebar and CSS only re-execute on user interaction
         
-        controller = st.session_state.controller
-        intersection = controller.intersections[0]
-        signals = [s for s in controller.signals if s.intersection == intersection]
-        
-        # ========== TOP METRICS ROW ==========
-        stats = controller.get_system_stats()
-        
-        col1, col2, col3, col4, col5, col6 = st.columns(6)
-        
-        with col1:
-            st.metric(
-                label="🔄 Total Cycles",
-                value=stats['total_cycles'],
-                delta=f"+{len([s for s in signals if s.state == SignalState.GREEN])} active"
-            )
-        
-        with col2:
-            st.metric(
-                label="⏱️ Avg Wait",
-                value=stats['average_wait_time'],
-                delta="Live"
-            )
-        
-        with col3:
-            st.metric(
-                label="🚑 Emergencies",
-                value=stats['emergency_responses'],
-                delta="Handled"
-            )
-        
-        with col4:
-            st.metric(
-                label="🛡️ Deadlocks Prevented",
-                value=stats['deadlock_preventions'],
-                delta="Protected"
-            )
-        
-        with col5:
-            st.metric(
-                label="🚗 Vehicles Passed",
-                value=stats['vehicles_passed'],
-                delta=f"+{random.randint(3,8)} this cycle"
-            )
-        
-        with col6:
-            active_count = len(intersection.active_directions)
-            st.metric(
-                label="🚦 Active Signals",
-                value=f"{active_count}/4",
-                delta="Live"
-            )
+        live_metrics()
         
         st.divider()
         
-        # ========== MAIN VISUALIZATION AREA ==========
-        
-        col_main_left, col_main_right = st.columns([2, 1])
-        
-        with col_main_left:
-            # Enhanced intersection diagram
-            fig_intersection = create_intersection_diagram(intersection, signals)
-            st.plotly_chart(fig_intersection, use_container_width=True, key="intersection_viz")
-            
-            # Traffic flow summary
-            st.markdown("### 📊 Traffic Flow Analysis")
-            
-            flow_cols = st.columns(4)
-            for idx, direction in enumerate(["NORTH", "SOUTH", "EAST", "WEST"]):
-                with flow_cols[idx]:
-                    signal = next((s for s in signals if s.direction == direction), None)
-                    if signal:
-                        density = intersection.traffic_density.get(direction, 0)
-                        
-                        # Determine flow status
-                        if signal.state == SignalState.GREEN:
-                            flow_status = "FLOWING"
-                            flow_color = "#4caf50"
-                            flow_icon = "🟢"
-                        elif signal.state == SignalState.YELLOW:
-                            flow_status = "SLOWING"
-                            flow_color = "#ffeb3b"
-                            flow_icon = "🟡"
-                        else:
-                            flow_status = "STOPPED"
-                            flow_color = "#f44336"
-                            flow_icon = "🔴"
-                        
-                        st.markdown(f"""
-                            <div class="traffic-flow">
-                                <div class="traffic-flow-title">{flow_icon} {direction}</div>
-                                <div class="traffic-flow-status" style="color: {flow_color};">{flow_status}</div>
-                                <div class="traffic-flow-load">Load: <b>{density}%</b></div>
-                                <div style="background: #e0e0e0; height: 10px; border-radius: 5px; overflow: hidden;">
-                                    <div class="flow-bar" style="width: {density}%;"></div>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
-        
-        with col_main_right:
-            # Signal status cards
-            st.markdown("### 🚦 Signal Status")
-            for signal in signals:
-                display_signal_status(signal, intersection)
-            
-            # Active directions summary
-            st.markdown("### ✅ Active Lanes")
-            if intersection.active_directions:
-                for direction in intersection.active_directions:
-                    st.success(f"🟢 **{direction}** - GREEN LIGHT")
-            else:
-                st.info("🔴 All signals at RED")
+        live_intersection_view()
         
         st.divider()
         
-        # ========== ANALYTICS DASHBOARD ==========
-        
-        st.markdown("### 📈 System Analytics Dashboard")
-        
-        fig_density, fig_cycles, fig_timeline, fig_wait = create_statistics_charts(controller)
-        
-        chart_col1, chart_col2 = st.columns(2)
-        with chart_col1:
-            st.plotly_chart(fig_density, use_container_width=True, key="chart_density")
-            st.plotly_chart(fig_timeline, use_container_width=True, key="chart_timeline")
-        
-        with chart_col2:
-            st.plotly_chart(fig_cycles, use_container_width=True, key="chart_cycles")
-            st.plotly_chart(fig_wait, use_container_width=True, key="chart_wait")
-        
-        st.divider()
-        
-        # ========== PERFORMANCE INSIGHTS ==========
-        
-        st.markdown("### 💡 Performance Insights")
-        
-        insight_cols = st.columns(3)
-        
-        with insight_cols[0]:
-            # Efficiency rating
-            avg_cycles = sum(s.cycle_count for s in signals) / len(signals) if signals else 0
-            efficiency = min(100, (avg_cycles / max(1, (datetime.now() - st.session_state.start_time).seconds / 10)) * 100)
-            
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h4>⚡ System Efficiency</h4>
-                    <div style="font-size: 2rem; font-weight: 700; color: #4caf50; margin: 1rem 0;">
-                        {efficiency:.1f}%
-                    </div>
-                    <div style="font-size: 0.9rem; color: #666;">
-                        Based on cycle completion rate
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with insight_cols[1]:
-            # Fairness score
-            cycle_counts = [s.cycle_count for s in signals]
-            if cycle_counts:
-                avg = sum(cycle_counts) / len(cycle_counts)
-                variance = sum((c - avg) ** 2 for c in cycle_counts) / len(cycle_counts)
-                fairness = max(0, 100 - (variance ** 0.5))
-            else:
-                fairness = 100
-            
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h4>⚖️ Fairness Score</h4>
-                    <div style="font-size: 2rem; font-weight: 700; color: #667eea; margin: 1rem 0;">
-                        {fairness:.1f}%
-                    </div>
-                    <div style="font-size: 0.9rem; color: #666;">
-                        Distribution balance across signals
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with insight_cols[2]:
-            # Safety rating
-            safety = max(0, 100 - (stats['deadlock_preventions'] * 2))
-            
-            st.markdown(f"""
-                <div class="metric-card">
-                    <h4>🛡️ Safety Rating</h4>
-                    <div style="font-size: 2rem; font-weight: 700; color: #f44336; margin: 1rem 0;">
-                        {safety:.1f}%
-                    </div>
-                    <div style="font-size: 0.9rem; color: #666;">
-                        Conflict avoidance effectiveness
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        st.divider()
-        
-        # ========== EVENT LOG ==========
-        
-        col_log_header, col_log_download = st.columns([3, 1])
-        
-        with col_log_header:
-            st.markdown("### 📝 System Event Log")
-        
-        with col_log_download:
-            st.markdown("<div style='padding-top: 0.5rem;'></div>", unsafe_allow_html=True)
-            # Placeholder for download button
-        
-        events = []
-        try:
-            while not intersection.event_log.empty():
-                events.append(intersection.event_log.get_nowait())
-        except:
-            pass
-        
-        if events:
-            # Display last 20 events in styled terminal
-            event_text = "\n".join(events[-20:])
-            st.markdown(f"""
-                <div class="event-log">
-                    <pre style="margin: 0; color: #0f0; font-size: 1rem; line-height: 1.6;">{event_text}</pre>
-                </div>
-            """, unsafe_allow_html=True)
-            
-            # Add CSV download button
-            with col_log_download:
-                create_download_button_for_logs(events)
-        else:
-            st.info("📭 No events logged yet. System is initializing...")
-        
-        # Auto-refresh for live updates
-        time.sleep(0.5)
-        st.rerun()
+        live_dashboard()
 
 
 if __name__ == "__main__":
@@ -5,12 +5,16 @@ Demonstrates: Concurrency, Synchronization, Thread Priority, Deadlock Prevention
 
 import threading
 import time
-import queue
+import itertools
+import heapq
+from array import array
+from collections import deque
+from types import MappingProxyType
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import Callable, Deque, List, Dict, Mapping, Optional, Tuple
 import random
-from datetime import datetime
+import numpy as np
 
 
 class SignalState(Enum):
@@ -21,6 +25,55 @@ class SignalState(Enum):
     EMERGENCY = "🚨 EMERGENCY"
 
 
+# Compact integer codes for storing signal states in numpy arrays
+STATE_CODES: Dict[SignalState, int] = {state: code for code, state in enumerate(SignalState)}
+_STATES_BY_CODE = tuple(SignalState)
+
+# Signal order within an intersection; also the offset of each direction's
+# slot in the controller's per-signal arrays
+DIRECTIONS = ("NORTH", "SOUTH", "EAST", "WEST")
+
+# Intersection geometry, shared read-only by every intersection
+_OPPOSITE: Mapping[str, str] = MappingProxyType({
+    "NORTH": "SOUTH", "SOUTH": "NORTH",
+    "EAST": "WEST", "WEST": "EAST"
+})
+_CONFLICTS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "NORTH": ("EAST", "WEST"),
+    "SOUTH": ("EAST", "WEST"),
+    "EAST": ("NORTH", "SOUTH"),
+    "WEST": ("NORTH", "SOUTH")
+})
+
+# One bit per direction for the active-direction bitmask, plus per-direction
+# masks of the bits that conflict with / oppose it
+_DIR_BIT: Mapping[str, int] = MappingProxyType({"NORTH": 1, "EAST": 2, "SOUTH": 4, "WEST": 8})
+_CONFLICT_MASK: Mapping[str, int] = MappingProxyType({
+    d: _DIR_BIT[a] | _DIR_BIT[b] for d, (a, b) in _CONFLICTS.items()
+})
+_OPPOSITE_BIT: Mapping[str, int] = MappingProxyType({
+    d: _DIR_BIT[o] for d, o in _OPPOSITE.items()
+})
+
+# Slot of each direction in per-direction arrays (DIRECTIONS order)
+_DIR_INDEX: Mapping[str, int] = MappingProxyType({d: i for i, d in enumerate(DIRECTIONS)})
+
+
+def _clamp_density(density: float) -> int:
+    """Coerce a density to the int 0-100 range the per-direction array stores"""
+    return max(0, min(100, int(density)))
+
+
+# Adaptive green-time multiplier for each density 0..100: scales the base
+# time from 50% to 150%
+_GREEN_MULTIPLIERS: Tuple[float, ...] = tuple(0.5 + i / 100.0 for i in range(101))
+
+# Deadlock prevention: global ordering of directions
+_DIRECTION_PRIORITY: Mapping[str, int] = MappingProxyType(
+    {"NORTH": 0, "EAST": 1, "SOUTH": 2, "WEST": 3}
+)
+
+
 class VehicleType(Enum):
     """Types of vehicles in the system"""
     NORMAL = "🚗"
@@ -55,161 +108,313 @@ class Intersection:
     """
     def __init__(self, intersection_id: str):
         self.intersection_id = intersection_id
-        self.lock = threading.RLock()  # Reentrant lock for nested locking
-        self.active_directions: List[str] = []
+        # Plain lock: no method re-acquires it, and wait_for predicates
+        # (can_proceed, has_active_conflict) read the snapshot lock-free
+        self.lock = threading.Lock()
+        self._active = 0  # Bitmask of green directions (see _DIR_BIT)
+        
+        # Immutable (active bitmask, pending emergency direction or None) read
+        # by can_proceed without locking; writers republish it under self.lock
+        self._snapshot: Tuple[int, Optional[str]] = (0, None)
         
         # Semaphore: Max 2 opposing directions can be green
         self.green_semaphore = threading.Semaphore(2)
         
-        # Condition variables for coordination
-        self.state_changed = threading.Condition(self.lock)
+        # One condition per direction, all sharing self.lock, so a change can
+        # wake exactly the signals it may admit
+        self._turn: Dict[str, threading.Condition] = {
+            direction: threading.Condition(self.lock) for direction in DIRECTIONS
+        }
+        
+        # Ready queue: heap of (ready time, arrival seq, direction) for signals
+        # waiting to turn green, admitted first come first served (guarded by
+        # self.lock)
+        self._ready: List[Tuple[float, int, str]] = []
+        self._ready_seq = itertools.count()
         
-        # Emergency vehicle queue (thread-safe)
-        self.emergency_queue: queue.PriorityQueue = queue.PriorityQueue()
+        # Emergency vehicles as a heap keyed (arrival ms, direction priority,
+        # vehicle id): first come first served with a total, deterministic
+        # tie-break (guarded by self.lock)
+        self.emergency_queue: List[Tuple[int, int, int, EmergencyVehicle]] = []
         
         # Deadlock prevention: ordering of directions
-        self.direction_priority = {"NORTH": 0, "EAST": 1, "SOUTH": 2, "WEST": 3}
+        self.direction_priority = _DIRECTION_PRIORITY
         
-        # Traffic density tracking for adaptive timing
-        self.traffic_density: Dict[str, int] = {
-            "NORTH": 0, "SOUTH": 0, "EAST": 0, "WEST": 0
+        # Traffic density tracking for adaptive timing, one slot per direction
+        # in DIRECTIONS order; single-slot reads and writes are atomic under
+        # the GIL, so this store needs no lock
+        self.traffic_density = array('i', [0] * len(DIRECTIONS))
+        
+        # can_proceed specialized per direction, with its masks bound once
+        self._can_proceed_fast: Dict[str, Callable[[], bool]] = {
+            direction: self._make_checker(direction) for direction in DIRECTIONS
         }
         
-        # Statistics
-        self.stats = TrafficStats()
+        # Emergency vehicle ids (statistics themselves live on each signal)
+        self._emergency_ids = itertools.count(1)
         
         # Pedestrian crossing state
         self.pedestrian_waiting: Dict[str, bool] = {
             "NORTH": False, "SOUTH": False, "EAST": False, "WEST": False
         }
         
-        # Event log for monitoring
-        self.event_log: queue.Queue = queue.Queue(maxsize=100)
+        # Event log for monitoring: a ring buffer of (sequence, message) kept in
+        # sequence order by _log_lock; readers copy it without locking, and
+        # deque append with maxlen drops the oldest entry atomically under the GIL
+        self.event_log: Deque[Tuple[int, str]] = deque(maxlen=200)
+        self._log_lock = threading.Lock()
+        
+        # Bumped on every logged event, density change and statistics update so
+        # observers can skip redrawing when nothing has changed (next() on a
+        # count is atomic).
+        # Logged events reuse the new value as their sequence number
+        self._versions = itertools.count(1)
+        self.state_version = 0
+        
+        # (epoch second, "HH:MM:SS") of the last log timestamp, so strftime
+        # only runs once per second; replaced as a whole tuple
+        self._ts_prefix = (-1, "")
         
+    def bump_version(self):
+        """Mark observable state (e.g. a signal's counters) as changed"""
+        self.state_version = next(self._versions)
+    
     def log_event(self, event: str):
         """Thread-safe event logging"""
-        try:
-            timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-            self.event_log.put_nowait(f"[{timestamp}] {event}")
-        except queue.Full:
-            # Remove oldest event if full
-            try:
-                self.event_log.get_nowait()
-                self.event_log.put_nowait(f"[{timestamp}] {event}")
-            except:
-                pass
+        now = time.time()
+        second = int(now)
+        cached_second, prefix = self._ts_prefix
+        if second != cached_second:
+            prefix = time.strftime("%H:%M:%S", time.localtime(second))
+            self._ts_prefix = (second, prefix)
+        timestamp = f"{prefix}.{int((now - second) * 1000):03d}"
+        
+        # Drawing the sequence number and appending under one small lock
+        # keeps the log in sequence order for events_since
+        with self._log_lock:
+            seq = next(self._versions)
+            self.state_version = seq
+            self.event_log.append((seq, f"[{timestamp}] {event}"))
+    
+    def events_since(self, seen: int) -> Tuple[List[str], int]:
+        """
+        Get events whose sequence number is above `seen`
+        
+        Returns:
+            Tuple of (new events still retained in the log, latest sequence number)
+        """
+        entries = self.event_log.copy()  # Single C-level copy, atomic under the GIL
+        latest = entries[-1][0] if entries else 0
+        return [message for seq, message in entries if seq > seen], max(latest, seen)
+    
+    @property
+    def active_directions(self) -> List[str]:
+        """Directions currently green, in DIRECTIONS order"""
+        active = self._active
+        return [d for d in DIRECTIONS if active & _DIR_BIT[d]]
     
     def get_opposing_direction(self, direction: str) -> str:
         """Get the opposing direction"""
-        opposites = {
-            "NORTH": "SOUTH", "SOUTH": "NORTH",
-            "EAST": "WEST", "WEST": "EAST"
-        }
-        return opposites.get(direction, "")
+        return _OPPOSITE.get(direction, "")
     
-    def get_conflicting_directions(self, direction: str) -> List[str]:
+    def get_conflicting_directions(self, direction: str) -> Tuple[str, ...]:
         """Get all directions that conflict with the given direction"""
-        conflicts = {
-            "NORTH": ["EAST", "WEST"],
-            "SOUTH": ["EAST", "WEST"],
-            "EAST": ["NORTH", "SOUTH"],
-            "WEST": ["NORTH", "SOUTH"]
-        }
-        return conflicts.get(direction, [])
+        return _CONFLICTS.get(direction, ())
+    
+    def _publish_snapshot(self) -> Optional[EmergencyVehicle]:
+        """
+        Prune cleared emergencies and republish the lock-free snapshot
+        
+        Caller must hold self.lock. Returns the pending emergency, if any.
+        """
+        emergencies = self.emergency_queue
+        while emergencies and emergencies[0][-1].handled:
+            heapq.heappop(emergencies)
+        head = emergencies[0][-1] if emergencies else None
+        self._snapshot = (self._active, head.direction if head else None)
+        return head
     
     def has_emergency_vehicle(self) -> Optional[EmergencyVehicle]:
         """Check if there's an emergency vehicle waiting"""
-        try:
-            # Peek at queue without removing
-            priority, emergency = self.emergency_queue.get_nowait()
-            self.emergency_queue.put((priority, emergency))
-            return emergency if not emergency.handled else None
-        except queue.Empty:
-            return None
+        with self.lock:
+            return self._publish_snapshot()
     
     def add_emergency_vehicle(self, direction: str):
         """Add emergency vehicle with highest priority"""
-        vehicle_id = self.stats.emergency_responses + 1
+        vehicle_id = next(self._emergency_ids)
         emergency = EmergencyVehicle(direction, vehicle_id)
-        # Priority: negative timestamp for FIFO with highest priority
-        self.emergency_queue.put((-time.time(), emergency))
+        arrival_ms = int(emergency.timestamp * 1000)
+        with self.lock:
+            # Never sort ahead of the emergency already announced: signals are
+            # yielding to it, and swapping heads would cascade preemptions
+            head = self._publish_snapshot()
+            if head is not None:
+                arrival_ms = max(arrival_ms, self.emergency_queue[0][0] + 1)
+            heapq.heappush(self.emergency_queue, (
+                arrival_ms, self.direction_priority[direction], vehicle_id, emergency
+            ))
+            self._publish_snapshot()
         self.log_event(f"🚨 EMERGENCY vehicle {vehicle_id} approaching from {direction}")
         
-        with self.state_changed:
-            self.state_changed.notify_all()
+        # Any signal may need to yield or preempt, so wake every waiter
+        self.wake(*DIRECTIONS)
+    
+    def _make_checker(self, direction: str) -> Callable[[], bool]:
+        """Build the emergency-aware can_proceed check for a single direction"""
+        conflict_mask = _CONFLICT_MASK[direction]
+        opposite_bit = _OPPOSITE_BIT[direction]
+        
+        def check() -> bool:
+            active, emergency_direction = self._snapshot
+            if emergency_direction and emergency_direction != direction:
+                return False
+            if active & conflict_mask:
+                return False
+            return bool(active & opposite_bit) or active.bit_count() < 2
+        
+        return check
     
     def can_proceed(self, direction: str, check_emergency: bool = True) -> bool:
         """
         Thread-safe check if direction can safely turn green
         Implements deadlock prevention through ordered resource acquisition
+        
+        Reads one consistent snapshot instead of taking the lock.
         """
-        with self.lock:
-            # Check for emergency vehicles first
-            if check_emergency:
-                emergency = self.has_emergency_vehicle()
-                if emergency and emergency.direction != direction:
-                    return False  # Wait for emergency to pass
-            
-            # Check if conflicting directions are active
-            conflicts = self.get_conflicting_directions(direction)
-            for conflict in conflicts:
-                if conflict in self.active_directions:
-                    self.stats.deadlock_preventions += 1
-                    return False
-            
-            # Check opposite direction (can both be green)
-            opposite = self.get_opposing_direction(direction)
-            if opposite in self.active_directions:
-                # Both opposing directions can be green together
-                return True
-            
-            # If no active directions, allow
-            if len(self.active_directions) == 0:
-                return True
-            
-            # Check if we can add another direction (max 2)
-            if len(self.active_directions) < 2:
-                return True
-            
+        if check_emergency:
+            return self._can_proceed_fast[direction]()
+        
+        active = self._snapshot[0]
+        
+        # Check if conflicting directions are active
+        if active & _CONFLICT_MASK[direction]:
             return False
+        
+        # Check opposite direction (can both be green)
+        if active & _OPPOSITE_BIT[direction]:
+            # Both opposing directions can be green together
+            return True
+        
+        # If no active directions, allow
+        if active == 0:
+            return True
+        
+        # Check if we can add another direction (max 2)
+        return active.bit_count() < 2
+    
+    def has_active_conflict(self, direction: str) -> bool:
+        """Whether a direction crossing the given one is currently green"""
+        return bool(self._snapshot[0] & _CONFLICT_MASK[direction])
+    
+    def claim(self, direction: str):
+        """
+        Mark a direction as active and republish the snapshot
+        
+        Caller must hold self.lock. Signals claim inside the same critical
+        section that grants their turn, so no conflicting waiter can be
+        admitted against a snapshot that does not show them yet.
+        """
+        self._active |= _DIR_BIT[direction]
+        self._publish_snapshot()
     
     def enter_intersection(self, direction: str, is_emergency: bool = False):
-        """Thread-safe method to mark direction as active"""
+        """
+        Take a green slot for a direction
+        
+        A regular signal has already claimed its bit in wait_for_turn; an
+        emergency bypasses the ready queue and claims it here.
+        """
         self.green_semaphore.acquire()
         
-        with self.lock:
-            self.active_directions.append(direction)
-            state = "EMERGENCY" if is_emergency else "GREEN"
-            self.log_event(f"✓ {direction} is now {state}")
-            self.stats.total_cycles += 1
-            
-            if is_emergency:
-                self.stats.emergency_responses += 1
+        if is_emergency:
+            with self.lock:
+                self.claim(direction)
+        
+        state = "EMERGENCY" if is_emergency else "GREEN"
+        self.log_event(f"✓ {direction} is now {state}")
     
     def exit_intersection(self, direction: str):
         """Thread-safe method to mark direction as inactive"""
+        bit = _DIR_BIT[direction]
         with self.lock:
-            if direction in self.active_directions:
-                self.active_directions.remove(direction)
-                self.log_event(f"✗ {direction} is now RED")
-                
+            was_active = self._active & bit
+            self._active &= ~bit
+            # Also picks up an emergency marked handled before this exit
+            self._publish_snapshot()
+        
+        if was_active:
+            self.log_event(f"✗ {direction} is now RED")
         self.green_semaphore.release()
         
-        with self.state_changed:
-            self.state_changed.notify_all()
+        # Wake every queued signal that the new snapshot makes safe (this
+        # covers the head of the queue, its opposite and a pending emergency),
+        # so no eligible waiter is left asleep until wait_for_turn times out
+        # and forces access; signals that stay blocked are not woken at all
+        with self.lock:
+            self._notify(*{
+                waiting for _, _, waiting in self._ready
+                if self._can_proceed_fast[waiting]()
+            })
     
-    def update_traffic_density(self, direction: str, density: int):
-        """Update traffic density for adaptive timing"""
+    def join_ready_queue(self, direction: str) -> Tuple[float, int, str]:
+        """Queue a direction for its next green; caller must hold self.lock"""
+        entry = (time.monotonic(), next(self._ready_seq), direction)
+        heapq.heappush(self._ready, entry)
+        return entry
+    
+    def leave_ready_queue(self, entry: Tuple[float, int, str]):
+        """Drop an entry from the ready queue; caller must hold self.lock"""
+        self._ready.remove(entry)
+        heapq.heapify(self._ready)
+    
+    def is_next_in_line(self, entry: Tuple[float, int, str]) -> bool:
+        """
+        Whether no earlier-queued signal crossing this one is still waiting
+        
+        An opposing signal may pair up regardless of order, and a pending
+        emergency skips the queue. Caller must hold self.lock.
+        """
+        direction = entry[2]
+        if self._snapshot[1] == direction:
+            return True
+        conflict_mask = _CONFLICT_MASK[direction]
+        return not any(
+            other < entry and _DIR_BIT[other[2]] & conflict_mask
+            for other in self._ready
+        )
+    
+    def turn_condition(self, direction: str) -> threading.Condition:
+        """Condition a direction's signal waits on for its turn"""
+        return self._turn[direction]
+    
+    def _notify(self, *directions: str):
+        """Wake the waiting signals for directions; caller must hold self.lock"""
+        for direction in directions:
+            self._turn[direction].notify_all()
+    
+    def wake(self, *directions: str):
+        """Wake the waiting signals for the given directions"""
         with self.lock:
-            self.traffic_density[direction] = max(0, min(100, density))
+            self._notify(*directions)
+    
+    def get_traffic_density(self, direction: str) -> int:
+        """Current traffic density (0-100) for a direction"""
+        return self.traffic_density[_DIR_INDEX[direction]]
+    
+    def update_traffic_density(self, direction: str, density: float):
+        """Update traffic density for adaptive timing"""
+        self.traffic_density[_DIR_INDEX[direction]] = _clamp_density(density)
+        self.bump_version()
+    
+    def update_traffic_densities(self, densities: Dict[str, float]):
+        """Update several directions' traffic density with one version bump"""
+        for direction, density in densities.items():
+            self.traffic_density[_DIR_INDEX[direction]] = _clamp_density(density)
+        self.bump_version()
     
     def get_adaptive_green_time(self, direction: str, base_time: float) -> float:
         """Calculate adaptive green time based on traffic density"""
-        with self.lock:
-            density = self.traffic_density[direction]
-            # Scale from 50% to 150% of base time based on density
-            multiplier = 0.5 + (density / 100.0)
-            return base_time * multiplier
+        return base_time * _GREEN_MULTIPLIERS[self.traffic_density[_DIR_INDEX[direction]]]
     
     def set_pedestrian_waiting(self, direction: str, waiting: bool):
         """Set pedestrian waiting status"""
@@ -224,38 +429,111 @@ class TrafficSignal(threading.Thread):
     Individual traffic signal thread
     Implements thread lifecycle, state management, and coordination
     """
+    MIN_RED_TIME = 2.0  # Seconds to stay red before competing for green again
+    
     def __init__(self, direction: str, intersection: Intersection, 
-                 base_green_time: float = 5.0, yellow_time: float = 2.0):
+                 base_green_time: float = 5.0, yellow_time: float = 2.0,
+                 states: Optional[np.ndarray] = None,
+                 cycle_counts: Optional[np.ndarray] = None, index: int = 0):
         super().__init__(daemon=True)
         self.direction = direction
         self.intersection = intersection
+        
+        # State and cycle count live in (possibly shared) arrays; the
+        # controller passes its own so it can summarise all signals at once
+        self._states = states if states is not None else np.zeros(1, dtype=np.int8)
+        self._cycle_counts = cycle_counts if cycle_counts is not None else np.zeros(1, dtype=np.int32)
+        self._index = index
         self.state = SignalState.RED
+        self.cycle_count = 0
+        
         self.base_green_time = base_green_time
         self.yellow_time = yellow_time
         self.running = True
-        self.cycle_count = 0
         self.last_state_change = time.time()
         
+        # Private generator so signal threads do not share the random module's
+        # global instance
+        self._rng = random.Random()
+        
+        # Set by stop() so phase sleeps end immediately instead of running out
+        self._stop_event = threading.Event()
+        
+        # Only this signal's thread writes these, so no lock is needed;
+        # the controller sums them across signals on demand
+        self.stats = TrafficStats()
+        
+        # Specialized can_proceed for this direction
+        self._check = intersection._can_proceed_fast[direction]
+    
+    @property
+    def state(self) -> SignalState:
+        return _STATES_BY_CODE[self._states[self._index]]
+    
+    @state.setter
+    def state(self, value: SignalState):
+        self._states[self._index] = STATE_CODES[value]
+    
+    @property
+    def cycle_count(self) -> int:
+        return int(self._cycle_counts[self._index])
+    
+    @cycle_count.setter
+    def cycle_count(self, value: int):
+        self._cycle_counts[self._index] = value
+        
     def wait_for_turn(self, timeout: float = 30.0) -> bool:
-        """Wait for safe access to intersection with timeout"""
-        start_wait = time.time()
+        """
+        Wait for safe access to intersection with timeout
         
-        while self.running:
-            if self.intersection.can_proceed(self.direction):
-                wait_time = time.time() - start_wait
-                self.intersection.stats.total_wait_time += wait_time
-                return True
+        Joins the intersection's ready queue and sleeps on this direction's
+        condition until it is both safe and this signal's turn; it is only
+        woken when an exit, emergency or stop may admit it, instead of polling.
+        On return the direction is already marked active.
+        The deadline is taken from the monotonic clock so wall-clock jumps can
+        neither cut the wait short nor inflate the recorded wait time.
+        """
+        start_wait = time.monotonic()
+        deadline = start_wait + timeout
+        intersection = self.intersection
+        turn = intersection.turn_condition(self.direction)
+        check = self._check
+        
+        with turn:
+            entry = intersection.join_ready_queue(self.direction)
+            
+            def may_enter() -> bool:
+                if not self.running:
+                    return True
+                if check():
+                    return intersection.is_next_in_line(entry)
+                if intersection.has_active_conflict(self.direction):
+                    self.stats.deadlock_preventions += 1
+                return False
             
-            # Check for timeout to prevent starvation
-            if time.time() - start_wait > timeout:
-                self.intersection.log_event(
-                    f"⚠ {self.direction} timeout - forcing access"
+            try:
+                granted = turn.wait_for(
+                    may_enter, timeout=max(deadline - time.monotonic(), 0.0)
                 )
-                return True
+            finally:
+                intersection.leave_ready_queue(entry)
+            
+            if not self.running:
+                return False
             
-            time.sleep(0.1)  # Small sleep to prevent busy waiting
+            # Still holding the lock the grant was decided under
+            intersection.claim(self.direction)
         
-        return False
+        if granted:
+            wait_time = time.monotonic() - start_wait
+            self.stats.total_wait_time += wait_time
+            return True
+        
+        # Timed out: force access to prevent starvation
+        self.intersection.log_event(
+            f"⚠ {self.direction} timeout - forcing access"
+        )
+        return True
     
     def handle_emergency(self) -> bool:
         """Check and handle emergency vehicle in this direction"""
@@ -265,9 +543,12 @@ class TrafficSignal(threading.Thread):
             # Emergency vehicle in our direction
             self.state = SignalState.EMERGENCY
             self.intersection.enter_intersection(self.direction, is_emergency=True)
+            self.stats.total_cycles += 1
+            self.stats.emergency_responses += 1
+            self.intersection.bump_version()
             
             # Clear emergency vehicle quickly (3 seconds)
-            time.sleep(3.0)
+            self._sleep_until(time.monotonic() + 3.0)
             
             emergency.handled = True
             self.intersection.exit_intersection(self.direction)
@@ -276,10 +557,30 @@ class TrafficSignal(threading.Thread):
         
         return False
     
+    def _set_phase(self, state: SignalState):
+        """Switch to a new signal state and restart its timer"""
+        self.state = state
+        self.last_state_change = time.time()
+    
+    def _sleep_until(self, deadline: float):
+        """
+        Sleep until an absolute time.monotonic() deadline
+        
+        Returns at once when the signal is stopped; the current cycle then
+        unwinds to RED without waiting and the run loop exits.
+        """
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            self._stop_event.wait(remaining)
+    
     def run(self):
         """Main thread execution loop"""
-        # Initial random offset to prevent all signals starting together
-        time.sleep(random.uniform(0, 2))
+        # Fixed phase offset: opposing pairs (N/S, E/W) start together and
+        # the cross street waits half a cycle, so the phases interleave
+        priority = self.intersection.direction_priority[self.direction]
+        self._sleep_until(
+            time.monotonic() + (priority % 2) * (self.base_green_time + self.yellow_time) / 2
+        )
         
         while self.running:
             try:
@@ -297,32 +598,36 @@ class TrafficSignal(threading.Thread):
                 )
                 
                 # GREEN PHASE
-                self.state = SignalState.GREEN
-                self.last_state_change = time.time()
+                self._set_phase(SignalState.GREEN)
                 self.intersection.enter_intersection(self.direction)
+                self.stats.total_cycles += 1
+                
+                # The rest of the cycle is a fixed schedule of absolute
+                # deadlines measured from the moment we turned green, so time
+                # spent logging or locking between phases does not drift
+                yellow_at = time.monotonic() + green_time
+                red_at = yellow_at + self.yellow_time
+                ready_at = red_at + self.MIN_RED_TIME
                 
                 # Simulate vehicles passing
-                vehicles_passed = random.randint(3, 8)
-                self.intersection.stats.vehicles_passed += vehicles_passed
+                self.stats.vehicles_passed += self._rng.randint(3, 8)
                 
-                time.sleep(green_time)
+                # The counters above changed after enter_intersection logged
+                self.intersection.bump_version()
                 
-                # YELLOW PHASE
-                self.state = SignalState.YELLOW
-                self.last_state_change = time.time()
+                self._sleep_until(yellow_at)
+                self._set_phase(SignalState.YELLOW)
                 self.intersection.log_event(f"⚠ {self.direction} is now YELLOW")
                 
-                time.sleep(self.yellow_time)
-                
-                # RED PHASE
-                self.state = SignalState.RED
-                self.last_state_change = time.time()
+                # Yellow and red share the tail of the cycle: the only work at
+                # the boundary is releasing the intersection
+                self._sleep_until(red_at)
+                self._set_phase(SignalState.RED)
                 self.intersection.exit_intersection(self.direction)
-                
                 self.cycle_count += 1
+                self.intersection.bump_version()
                 
-                # Minimum red time before trying again
-                time.sleep(2.0)
+                self._sleep_until(ready_at)
                 
             except Exception as e:
                 self.intersection.log_event(f"❌ Error in {self.direction}: {str(e)}")
@@ -331,6 +636,12 @@ class TrafficSignal(threading.Thread):
     def stop(self):
         """Gracefully stop the thread"""
         self.running = False
+        
+        # Cut short any phase sleep in progress
+        self._stop_event.set()
+        
+        # Wake the thread if it is blocked in wait_for_turn
+        self.intersection.wake(self.direction)
     
     def get_state_info(self) -> Dict:
         """Get current state information"""
@@ -352,15 +663,45 @@ class TrafficController:
         self.signals: List[TrafficSignal] = []
         self.running = False
         
+        # Per-signal state in parallel arrays (signal i of intersection k is
+        # slot k * 4 + _DIR_INDEX[direction]); TrafficSignal objects are views
+        num_signals = num_intersections * len(DIRECTIONS)
+        self.states = np.full(num_signals, STATE_CODES[SignalState.RED], dtype=np.int8)
+        self.cycle_counts = np.zeros(num_signals, dtype=np.int32)
+        
+        # Lookup tables so callers never scan self.signals
+        self._signals_by_intersection: Dict[Intersection, List[TrafficSignal]] = {}
+        self._signal_by_dir: Dict[tuple, TrafficSignal] = {}
+        
         # Create intersections and signals
         for i in range(num_intersections):
             intersection = Intersection(f"Intersection-{i+1}")
             self.intersections.append(intersection)
             
             # Create signals for each direction
-            for direction in ["NORTH", "SOUTH", "EAST", "WEST"]:
-                signal = TrafficSignal(direction, intersection)
+            self._signals_by_intersection[intersection] = []
+            for direction in DIRECTIONS:
+                signal = TrafficSignal(
+                    direction, intersection,
+                    states=self.states, cycle_counts=self.cycle_counts,
+                    index=i * len(DIRECTIONS) + _DIR_INDEX[direction]
+                )
                 self.signals.append(signal)
+                self._signals_by_intersection[intersection].append(signal)
+                self._signal_by_dir[(i, direction)] = signal
+    
+    def signals_at(self, intersection_idx: int = 0) -> List[TrafficSignal]:
+        """Signals of one intersection, in DIRECTIONS order"""
+        return self._signals_by_intersection[self.intersections[intersection_idx]]
+    
+    def get_signal(self, intersection_idx: int, direction: str) -> Optional[TrafficSignal]:
+        """Signal facing the given direction at one intersection"""
+        return self._signal_by_dir.get((intersection_idx, direction))
+    
+    def signal_slice(self, intersection_idx: int = 0) -> slice:
+        """Slice of the per-signal arrays belonging to one intersection"""
+        start = intersection_idx * len(DIRECTIONS)
+        return slice(start, start + len(DIRECTIONS))
     
     def start(self):
         """Start all traffic signals"""
@@ -368,12 +709,13 @@ class TrafficController:
             return
         
         self.running = True
-        for signal in self.signals:
-            signal.start()
         
-        # Log system start
+        # Log system start before any signal thread can log its first green
         for intersection in self.intersections:
             intersection.log_event("🚦 Traffic Control System STARTED")
+        
+        for signal in self.signals:
+            signal.start()
     
     def stop(self):
         """Stop all traffic signals gracefully"""
@@ -394,18 +736,34 @@ class TrafficController:
         for signal in self.signals:
             signal.join(timeout=2.0)
     
-    def get_system_stats(self) -> Dict:
-        """Get aggregated system statistics"""
+    @property
+    def state_version(self) -> int:
+        """Monotonic counter that changes whenever any intersection's state does"""
+        return sum(intersection.state_version for intersection in self.intersections)
+    
+    @staticmethod
+    def _sum_stats(signals: List[TrafficSignal]) -> TrafficStats:
+        """Add up the per-signal counters"""
         total_stats = TrafficStats()
         
-        for intersection in self.intersections:
-            stats = intersection.stats
+        for signal in signals:
+            stats = signal.stats
             total_stats.total_cycles += stats.total_cycles
             total_stats.total_wait_time += stats.total_wait_time
             total_stats.emergency_responses += stats.emergency_responses
             total_stats.deadlock_preventions += stats.deadlock_preventions
             total_stats.vehicles_passed += stats.vehicles_passed
         
+        return total_stats
+    
+    def intersection_stats(self, intersection_idx: int = 0) -> TrafficStats:
+        """Aggregated statistics for one intersection"""
+        return self._sum_stats(self.signals_at(intersection_idx))
+    
+    def get_system_stats(self) -> Dict:
+        """Get aggregated system statistics"""
+        total_stats = self._sum_stats(self.signals)
+        
         # Calculate averages
         if total_stats.total_cycles > 0:
             total_stats.average_green_time = total_stats.total_wait_time / total_stats.total_cycles
@@ -423,10 +781,15 @@ class TrafficController:
         if 0 <= intersection_idx < len(self.intersections):
             self.intersections[intersection_idx].add_emergency_vehicle(direction)
     
-    def update_traffic_density(self, intersection_idx: int, direction: str, density: int):
+    def update_traffic_density(self, intersection_idx: int, direction: str, density: float):
         """Update traffic density for adaptive timing"""
         if 0 <= intersection_idx < len(self.intersections):
             self.intersections[intersection_idx].update_traffic_density(direction, density)
+    
+    def update_traffic_densities(self, intersection_idx: int, densities: Dict[str, float]):
+        """Update traffic density for several directions at once"""
+        if 0 <= intersection_idx < len(self.intersections):
+            self.intersections[intersection_idx].update_traffic_densities(densities)
 
 
 if __name__ == "__main__":